@@ -4,9 +4,15 @@ import logging
 import os
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Not available on Windows, the default event loop is used
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -352,6 +358,14 @@ def main():
     app = AsyncThermostatApp(config)
     
     async def run_app():
+        # Blocking component calls go through run_in_executor(None, ...). They are
+        # short and few on a single-board controller, so a small pool replaces the
+        # default min(32, cpu_count + 4) threads
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+            max_workers=app.app_config.get('executor_workers', 4),
+            thread_name_prefix="therm-io"
+        ))
+        
         try:
             # Initialize components
             await app.initialize()
@@ -393,7 +407,9 @@ def main():
             # Cleanup
             await app.shutdown()
     
-    # Run the async application
+    # Run the async application, on uvloop when it is installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(run_app())
 
 
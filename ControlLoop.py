@@ -4,16 +4,6 @@ from typing import Type, TypeVar
 from SafeCommandDispatcher import SafeCommandDispatcher
 from StinkMode import StinkMode
 
-async def clear_async_queue(queue: asyncio.Queue) -> None:
-    """
-    Simple function to clear an async queue
-    """
-    while not queue.empty():
-        try:
-            queue.get_nowait()
-        except asyncio.QueueEmpty:
-            break
-
 CP = TypeVar("CP", bound="AsyncCommandProcessor")
 
 class AsyncCommandProcessor:
@@ -212,8 +212,8 @@ class ESPHomeACComponent(Component):
                 if self.client:
                     try:
                         await self.client.disconnect()
-                    except:
-                        pass  # Ignore errors during cleanup
+                    except Exception:
+                        pass  # Ignore errors during cleanup, but let cancellation through
                 
                 # Create new client
                 self.client = APIClient(self.host, self.port, self.password)
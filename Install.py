@@ -13,6 +13,7 @@ from pathlib import Path
 class DeviceInstaller:
     def __init__(self):
         self.required_packages = self._get_required_packages()
+        self.optional_packages = self._get_optional_packages()
         self.system_packages = self._get_system_packages()
         
     def _get_required_packages(self):
@@ -49,6 +50,19 @@ class DeviceInstaller:
             'logging': None,  # Built-in
         }
     
+    def _get_optional_packages(self):
+        """
+        Packages that speed things up but are not needed to run
+        Format: 'package_name': 'pip_install_name'
+        """
+        optional = {}
+        
+        # Faster event loop (Linux/macOS only)
+        if sys.platform != 'win32':
+            optional['uvloop'] = 'uvloop'
+        
+        return optional
+    
     def _get_system_packages(self):
         """
         System packages that might need to be installed via apt
@@ -134,6 +148,17 @@ class DeviceInstaller:
         
         return failed_packages
     
+    def install_optional_packages(self):
+        """Install optional packages; failures only warn"""
+        if not self.optional_packages:
+            return
+        
+        print("\n=== Installing Optional Packages ===")
+        
+        for package_name, pip_name in self.optional_packages.items():
+            if not self.install_package(package_name, pip_name):
+                print(f"⚠️  {package_name} is optional, continuing without it")
+    
     def verify_installations(self):
         """Verify all packages can be imported"""
         print("\n=== Verifying Package Imports ===")
@@ -251,6 +276,8 @@ if __name__ == "__main__":
             print(f"sudo apt update && sudo apt install {' '.join(self.system_packages)}")
             return False
         
+        self.install_optional_packages()
+        
         # Verify installations
         failed_imports = self.verify_installations()
         
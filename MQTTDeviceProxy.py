@@ -89,7 +89,7 @@ class MQTTComponentProxy:
                     trigger_events = getattr(method, '_trigger_events', [])
                     if event_name in trigger_events:
                         return method_name
-            except:
+            except Exception:
                 pass
         return None
     
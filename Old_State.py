@@ -1,20 +1,44 @@
 import asyncio
+import functools
+import heapq
+import itertools
 import time
 import logging
-from typing import Type, TypeVar, Dict, Any, Optional
+from typing import Optional, Callable
 from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
 
-SM = TypeVar("SM", bound="AsyncStateManager")
+logger = logging.getLogger(__name__)
 
-async def clear_async_queue(queue: asyncio.Queue) -> None:
+_HAS_TASK_GROUP = hasattr(asyncio, 'TaskGroup')
+_MISSING = object()
+
+@dataclass(slots=True, frozen=True)
+class CmdInfo:
     """
-    Simple function to clear an async queue
+    One external state definition. Definitions are read on every refresh,
+    so they are frozen into slotted records instead of per-command dicts.
     """
-    while not queue.empty():
-        try:
-            queue.get_nowait()
-        except asyncio.QueueEmpty:
-            break
+    status_path: str
+    status_method_name: str
+    component_path: str
+    type: Optional[str] = None
+    command_str: Optional[str] = None
+    status_str: Optional[str] = None
+    command_method_name: Optional[str] = None
+    command_method: Optional[Callable] = None
+    status_method: Optional[Callable] = None  # ESPHome status proxy method
+    status_path_lower: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'status_path_lower', self.status_path.lower())
+
+    @classmethod
+    def from_dict(cls, definition: dict) -> "CmdInfo":
+        """Build a record from a definition dict, ignoring keys it doesn't track"""
+        return cls(**{f.name: definition[f.name] for f in fields(cls)
+                      if f.init and f.name in definition})
 
 class AsyncStateManager:
     """
@@ -25,32 +49,31 @@ class AsyncStateManager:
     MQTT and ESPHome components.
     """
     _instance = None
-    _lock = asyncio.Lock()
+    _lock = None  # Created lazily so it binds to the running event loop
+    _wait_id_counter = itertools.count()  # Internal heartbeat wait IDs
     
-    def __new__(cls: Type[SM], *args, **kwargs) -> SM:
-        """
-        Ensures a single instance of this object (singleton pattern).
-        """
-        if not cls._instance:
-            cls._instance = super(AsyncStateManager, cls).__new__(cls)
+    def __new__(cls, *args, **kwargs):
+        # Construction never re-runs initialization; get_instance builds the instance once
+        if cls._instance is None:
+            raise RuntimeError("AsyncStateManager must be created with get_instance()")
         return cls._instance
     
-    def __init__(self, controller=None, config=None):
-        # Only initialize once
+    def _init(self, controller=None, config=None):
         if config is None:
             raise ValueError("Config must be provided on first initialization")
         
         self.config = config
 
-        if hasattr(self, '_initialized'):
-            return
-        
         if controller is None:
             raise ValueError("Controller must be provided on first initialization")
         
         for key, value in self.config.get("config", {}).items():
             setattr(self, key, value)
 
+        # Resolve refresh timing defaults once instead of on every tick
+        self.stale_threshold = getattr(self, 'stale_threshold', 30)
+        self.heartbeat_refresh_interval = getattr(self, 'heartbeat_refresh_interval', 30)
+
         self._internal_states = {}
         for key, value in self.config.get("internal_state", {}).items():
             self._internal_states[key] = value
@@ -58,22 +81,56 @@ class AsyncStateManager:
         # Initialize external states as a watched dictionary
         self._external_states = {}
 
-        self.state_queue = asyncio.Queue()
+        # External and internal states merged, kept in sync as either changes
+        self._merged_states = dict(self._internal_states)
+
+        # Pending update for websocket emission; bursts are squashed into it
+        self._latest_state = None
+        self._state_event = asyncio.Event()
         self.controller = controller
         
         # Get both MQTT and ESPHome state definitions
         self.external_state_definitions = self._discover_all_state_definitions()
-        print(self.external_state_definitions)
+        logger.debug("State definitions: %s", self.external_state_definitions)
+        
+        # Status paths never change, so classify each command for periodic refresh once
+        self._periodic_refresh_commands = []
+        for cmd_info in self.external_state_definitions:
+            if self._needs_periodic_refresh(cmd_info):
+                self._periodic_refresh_commands.append(cmd_info)
+        
+        # MQTT commands bucketed by device once, so full refreshes don't regroup them
+        commands_by_device = defaultdict(list)
+        for cmd_info in self.external_state_definitions:
+            if cmd_info.type != 'esphome':
+                commands_by_device[cmd_info.component_path.split('.')[0]].append(cmd_info)
+        self._commands_by_device = {device_name: tuple(commands)
+                                    for device_name, commands in commands_by_device.items()}
+        
+        # Min-heap of (last_update, seq, cmd_info) so stale selection only touches stale entries
+        self._last_update = {}  # status_path -> monotonic time of the last external update
+        self._stale_heap = [(float('-inf'), seq, cmd_info)
+                            for seq, cmd_info in enumerate(self._periodic_refresh_commands)]
+        
         self.running = False
-        self.refresh_task = None
+        self._loop = None  # Event loop, cached when the listeners are set up
+        self._bg_tasks = []  # Periodic refresh tasks
+        # Bounds how many data commands wait on a status response at once
+        self._refresh_sem = asyncio.Semaphore(getattr(self, 'max_inflight_refresh', 16))
+        self._stop_event = asyncio.Event()  # Set on stop to wake the refresh loops
         self.event_listeners = {}  # Track active event listeners
         self.esphome_monitor_tasks = {}  # Track ESPHome monitoring tasks
         
         # Heartbeat management
         self.heartbeat_definitions = self._discover_heartbeat_devices()
         self.heartbeat_listeners = {}  # Track heartbeat listeners
+        self._heartbeat_inbox = asyncio.Queue(maxsize=100)  # (wait_id, data) from all device managers
+        self._heartbeat_waits = {}  # wait_id -> (device_manager, forwarder, callback, is_coro)
+        self._heartbeat_monitor_task = None
         
-        self._initialized = True
+        # Lookup tables filled in as paths and proxies are resolved
+        self._nested_setters = {}  # status_path -> setter for its nested attribute
+        self._component_proxies = {}  # component_path -> component proxy
         
         # Create nested attribute structure
         self._create_nested_attributes()
@@ -92,15 +149,15 @@ class AsyncStateManager:
         mqtt_data_commands = [cmd for cmd in all_data_commands if cmd.get('type') != 'ESPHomeACComponent']
         esphome_data_commands = [cmd for cmd in all_data_commands if cmd.get('type') == 'ESPHomeACComponent']
         
-        print(f"Discovered {len(mqtt_data_commands)} MQTT data commands")
-        print(f"Discovered {len(esphome_data_commands)} ESPHome data commands")
+        logger.info("Discovered %s MQTT data commands", len(mqtt_data_commands))
+        logger.info("Discovered %s ESPHome data commands", len(esphome_data_commands))
         
         # Add MQTT data commands (with proper status pairing)
         for cmd in mqtt_data_commands:
             if cmd.get('status_method_name') and cmd.get('status_path'):
                 state_definitions.append(cmd)
             else:
-                print(f"Skipping MQTT command without status: {cmd.get('command_str')}")
+                logger.debug("Skipping MQTT command without status: %s", cmd.get('command_str'))
         
         # Add ESPHome data commands (with proper status pairing)
         for cmd in esphome_data_commands:
@@ -108,12 +165,12 @@ class AsyncStateManager:
                 # Mark as ESPHome type for different handling
                 cmd['type'] = 'ESPHomeACComponent'
                 state_definitions.append(cmd)
-                print(f"Added ESPHome data command: {cmd.get('command_str')} -> {cmd.get('status_str')}")
+                logger.debug("Added ESPHome data command: %s -> %s", cmd.get('command_str'), cmd.get('status_str'))
             else:
-                print(f"Skipping ESPHome command without status: {cmd.get('command_str')}")
+                logger.debug("Skipping ESPHome command without status: %s", cmd.get('command_str'))
         
-        print(f"Total state definitions: {len(state_definitions)}")
-        return state_definitions
+        logger.info("Total state definitions: %s", len(state_definitions))
+        return tuple(CmdInfo.from_dict(cmd) for cmd in state_definitions)
     
     def _discover_esphome_state_definitions(self):
         """
@@ -121,54 +178,54 @@ class AsyncStateManager:
         """
         esphome_definitions = []
         
-        print("DEBUG: Starting ESPHome state definition discovery")
+        logger.debug("Starting ESPHome state definition discovery")
         
         # Check if we have ESPHome components
         if not hasattr(self.controller, 'esphome_components'):
-            print("DEBUG: No esphome_components attribute found on controller")
+            logger.debug("No esphome_components attribute found on controller")
             return esphome_definitions
         
-        print(f"DEBUG: Found esphome_components: {list(self.controller.esphome_components.keys())}")
+        logger.debug("Found esphome_components: %s", list(self.controller.esphome_components.keys()))
         
         from ESPHomeACComponent import ESPHomeACComponent
         
         for component_key, esphome_component_proxy in self.controller.esphome_components.items():
-            print(f"DEBUG: Processing component_key: '{component_key}' (type: {type(component_key)})")
+            logger.debug("Processing component_key: '%s' (type: %s)", component_key, type(component_key))
             
             # Safely handle component_key parsing
             if not component_key:
-                print(f"WARNING: Empty component_key found")
+                logger.warning("Empty component_key found")
                 continue
                 
             if component_key is None:
-                print(f"WARNING: None component_key found")
+                logger.warning("None component_key found")
                 continue
                 
             if not isinstance(component_key, str):
-                print(f"WARNING: component_key is not a string: {component_key} (type: {type(component_key)})")
+                logger.warning("component_key is not a string: %s (type: %s)", component_key, type(component_key))
                 continue
                 
             if '.' not in component_key:
-                print(f"WARNING: component_key does not contain '.': '{component_key}'")
+                logger.warning("component_key does not contain '.': '%s'", component_key)
                 continue
                 
             try:
                 device_name, component_name = component_key.split('.', 1)
-                print(f"DEBUG: Split successful - device_name: '{device_name}', component_name: '{component_name}'")
+                logger.debug("Split successful - device_name: '%s', component_name: '%s'", device_name, component_name)
             except (ValueError, AttributeError) as e:
-                print(f"ERROR: Could not parse ESPHome component key '{component_key}': {e}")
+                logger.error("Could not parse ESPHome component key '%s': %s", component_key, e)
                 continue
             
             # Ensure we have valid names
             if not device_name or not component_name:
-                print(f"WARNING: Invalid device/component names from key '{component_key}' - device_name: '{device_name}', component_name: '{component_name}'")
+                logger.warning("Invalid device/component names from key '%s' - device_name: '%s', component_name: '%s'", component_key, device_name, component_name)
                 continue
             
-            print(f"DEBUG: Processing ESPHome component: {device_name}.{component_name}")
+            logger.debug("Processing ESPHome component: %s.%s", device_name, component_name)
             
             # Find all status methods in the ESPHome component
             esphome_methods = [method for method in dir(ESPHomeACComponent) if not method.startswith('_')]
-            print(f"DEBUG: ESPHomeACComponent methods: {esphome_methods}")
+            logger.debug("ESPHomeACComponent methods: %s", esphome_methods)
             
             for method_name in esphome_methods:
                 if not method_name or method_name.startswith('_'):
@@ -177,22 +234,22 @@ class AsyncStateManager:
                 try:
                     method = getattr(ESPHomeACComponent, method_name)
                     if callable(method) and hasattr(method, '_is_mqtt_status'):
-                        print(f"DEBUG: Found status method: {method_name}")
+                        logger.debug("Found status method: %s", method_name)
                         
                         # Create a state definition for this status method
                         status_path = f"{device_name}.{component_name}.{method_name}"
                         component_path = f"{device_name}.{component_name}"
                         
-                        print(f"DEBUG: Creating status_path: '{status_path}', component_path: '{component_path}'")
+                        logger.debug("Creating status_path: '%s', component_path: '%s'", status_path, component_path)
                         
                         # Verify the proxy has this method
                         if not hasattr(esphome_component_proxy, method_name):
-                            print(f"WARNING: ESPHome component proxy missing method {method_name}")
+                            logger.warning("ESPHome component proxy missing method %s", method_name)
                             continue
                         
                         # Get the actual proxy method
                         status_proxy_method = getattr(esphome_component_proxy, method_name)
-                        print(f"DEBUG: Got proxy method for {method_name}")
+                        logger.debug("Got proxy method for %s", method_name)
                         
                         esphome_definition = {
                             "type": "esphome",
@@ -206,15 +263,13 @@ class AsyncStateManager:
                         }
                         
                         esphome_definitions.append(esphome_definition)
-                        print(f"DEBUG: Added ESPHome status method: {status_path}")
+                        logger.debug("Added ESPHome status method: %s", status_path)
                         
                 except Exception as e:
-                    print(f"ERROR: Error processing ESPHome method {method_name} for {component_key}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error processing ESPHome method %s for %s: %s", method_name, component_key, e)
                     continue
         
-        print(f"DEBUG: ESPHome discovery complete. Found {len(esphome_definitions)} definitions")
+        logger.debug("ESPHome discovery complete. Found %s definitions", len(esphome_definitions))
         return esphome_definitions
         
     @classmethod
@@ -222,12 +277,18 @@ class AsyncStateManager:
         """
         Get the singleton instance. If it doesn't exist, create it with the provided parameters.
         """
+        # The instance is write-once, so only creation needs the lock
+        if cls._instance is not None:
+            return cls._instance
+        
+        cls._lock = cls._lock or asyncio.Lock()
         async with cls._lock:
             if cls._instance is None:
-                instance = cls(controller, config)
+                instance = object.__new__(cls)
+                instance._init(controller, config)
                 await instance._setup_event_listeners()
                 await instance._setup_heartbeat_listeners()
-                return instance
+                cls._instance = instance
             return cls._instance
     
     @classmethod
@@ -235,6 +296,10 @@ class AsyncStateManager:
         """
         Reset the singleton instance. Useful for testing or reinitialization.
         """
+        if cls._instance is None:
+            return
+        
+        cls._lock = cls._lock or asyncio.Lock()
         async with cls._lock:
             if cls._instance and cls._instance.running:
                 await cls._instance.stop_continuous_refresh()
@@ -260,7 +325,7 @@ class AsyncStateManager:
                     'execute_and_wait_method': device_proxy.execute_heartbeat_and_wait,
                     'get_latest_method': device_proxy.get_latest_heartbeat
                 })
-                print(f"Discovered heartbeat for device: {device_name}")
+                logger.debug("Discovered heartbeat for device: %s", device_name)
         
         return heartbeat_definitions
         
@@ -269,7 +334,7 @@ class AsyncStateManager:
         # Create component-level attributes
         for method_info in self.external_state_definitions:
             # Create nested attributes: self.hvac.temp_sensor.temp_status
-            self._create_nested_path(method_info['status_path'])
+            self._create_nested_path(method_info.status_path)
         
         # Create device-level heartbeat attributes
         for heartbeat_info in self.heartbeat_definitions:
@@ -288,97 +353,92 @@ class AsyncStateManager:
         
         # Set the final attribute to None initially
         setattr(current, parts[-1], None)
-    
-    def _set_nested_value(self, path, value):
-        """Set a value in the nested structure"""
-        parts = path.split('.')
-        current = self
-        
-        for part in parts[:-1]:
-            current = getattr(current, part)
         
-        setattr(current, parts[-1], value)
+        # Bind a setter for this path so updates skip the attribute walk
+        self._nested_setters[path] = functools.partial(setattr, current, parts[-1])
+    
+    def _get_component_proxy(self, component_path):
+        """Resolve a component proxy from the controller, caching it by path"""
+        component_proxy = self._component_proxies.get(component_path)
+        if component_proxy is None:
+            component_proxy = self.controller
+            for part in component_path.split('.'):
+                component_proxy = getattr(component_proxy, part)
+            self._component_proxies[component_path] = component_proxy
+        return component_proxy
     
     async def _setup_event_listeners(self):
         """
         Setup event-driven listeners for all component status methods.
         This handles both MQTT and ESPHome components.
         """
-        print("Setting up event-driven state listeners...")
+        logger.info("Setting up event-driven state listeners...")
+        
+        # Cache the loop once; listener and refresh tasks are scheduled on it directly
+        self._loop = asyncio.get_running_loop()
         
         for cmd_info in self.external_state_definitions:
-            print(f"DEBUG: Processing cmd_info: {cmd_info.get('command_str')} -> {cmd_info.get('status_str')}")
+            logger.debug("Processing cmd_info: %s -> %s", cmd_info.command_str, cmd_info.status_str)
             
             # Skip entries without proper status methods
-            if not cmd_info.get('status_method_name') or not cmd_info.get('status_path'):
-                print(f"DEBUG: Skipping command without status: {cmd_info.get('command_str')}")
+            if not cmd_info.status_method_name or not cmd_info.status_path:
+                logger.debug("Skipping command without status: %s", cmd_info.command_str)
                 continue
             
-            if cmd_info.get('type') == 'esphome':
+            if cmd_info.type == 'esphome':
                 await self._setup_esphome_listener(cmd_info)
             else:
                 await self._setup_mqtt_listener(cmd_info)
     
     async def _setup_mqtt_listener(self, cmd_info):
         """Setup listener for MQTT component status method"""
-        print(f"DEBUG: Setting up MQTT listener for cmd_info: {cmd_info}")
+        logger.debug("Setting up MQTT listener for cmd_info: %s", cmd_info)
         
-        status_method_name = cmd_info.get('status_method_name')
-        component_path = cmd_info.get('component_path')
-        status_path = cmd_info.get('status_path')
+        status_method_name = cmd_info.status_method_name
+        component_path = cmd_info.component_path
+        status_path = cmd_info.status_path
         
-        print(f"DEBUG: MQTT listener - status_method_name: '{status_method_name}', component_path: '{component_path}', status_path: '{status_path}'")
+        logger.debug("MQTT listener - status_method_name: '%s', component_path: '%s', status_path: '%s'", status_method_name, component_path, status_path)
         
         # Validate required fields
         if not status_method_name or not component_path or not status_path:
-            print(f"WARNING: Invalid MQTT command info, skipping: {cmd_info}")
+            logger.warning("Invalid MQTT command info, skipping: %s", cmd_info)
             return
             
         try:
             # Get the component proxy
-            print(f"DEBUG: Splitting component_path: '{component_path}' (type: {type(component_path)})")
+            logger.debug("Splitting component_path: '%s' (type: %s)", component_path, type(component_path))
             
             if component_path is None:
-                print(f"ERROR: component_path is None!")
+                logger.error("component_path is None!")
                 return
                 
             if not isinstance(component_path, str):
-                print(f"ERROR: component_path is not a string: {component_path} (type: {type(component_path)})")
+                logger.error("component_path is not a string: %s (type: %s)", component_path, type(component_path))
                 return
             
             parts = component_path.split('.')
-            print(f"DEBUG: component_path parts: {parts}")
+            logger.debug("component_path parts: %s", parts)
             
             component_proxy = self.controller
             for i, part in enumerate(parts):
                 if not part:  # Skip empty parts
-                    print(f"WARNING: Empty part at index {i} in component_path: {parts}")
+                    logger.warning("Empty part at index %s in component_path: %s", i, parts)
                     continue
-                print(f"DEBUG: Getting attribute '{part}' from {type(component_proxy)}")
+                logger.debug("Getting attribute '%s' from %s", part, type(component_proxy))
                 component_proxy = getattr(component_proxy, part)
-                print(f"DEBUG: Got {type(component_proxy)}")
+                logger.debug("Got %s", type(component_proxy))
+            
+            # Cache the resolved proxy for the refresh paths
+            self._component_proxies[component_path] = component_proxy
             
             # Verify the component proxy has the required methods
             if not hasattr(component_proxy, 'wait_for_continuous'):
-                print(f"WARNING: Component {component_path} does not support continuous waiting")
+                logger.warning("Component %s does not support continuous waiting", component_path)
                 return
             
             # Create a callback for this specific status update
-            def make_status_callback(status_path_local, component_path_local):
-                async def status_callback(status_data):
-                    if status_data is not None:
-                        print(f"MQTT event-driven update: {status_path_local} = {status_data}")
-                        # Update nested attributes
-                        self._set_nested_value(status_path_local, status_data)
-                        # Update external states dictionary
-                        new_states = {**self._external_states}
-                        new_states[status_path_local] = status_data
-                        self.external_states = new_states
-                    else:
-                        print(f"No MQTT data received for {status_path_local}")
-                return status_callback
-            
-            callback = make_status_callback(status_path, component_path)
+            callback = functools.partial(self._dispatch_status, status_path)
             
             # Start continuous monitoring for this status method
             wait_id = component_proxy.wait_for_continuous(
@@ -394,31 +454,29 @@ class AsyncStateManager:
                 'status_method': status_method_name
             }
             
-            print(f"Started MQTT event listener for {status_path}")
+            logger.debug("Started MQTT event listener for %s", status_path)
             
         except Exception as e:
-            print(f"ERROR: Error setting up MQTT listener for {status_path}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error setting up MQTT listener for %s: %s", status_path, e)
     
     async def _setup_esphome_listener(self, cmd_info):
         """Setup listener for ESPHome component status method"""
-        print(f"DEBUG: Setting up ESPHome listener for: {cmd_info}")
+        logger.debug("Setting up ESPHome listener for: %s", cmd_info)
         
-        status_method_name = cmd_info.get('status_method_name')
-        status_path = cmd_info.get('status_path')
-        component_path = cmd_info.get('component_path')
+        status_method_name = cmd_info.status_method_name
+        status_path = cmd_info.status_path
+        component_path = cmd_info.component_path
         
         # Validate required fields
         if not status_method_name or not status_path or not component_path:
-            print(f"WARNING: Invalid ESPHome command info, skipping: {cmd_info}")
+            logger.warning("Invalid ESPHome command info, skipping: %s", cmd_info)
             return
         
         try:
             # Get the ESPHome component proxy directly
             parts = component_path.split('.')
             if len(parts) != 2:
-                print(f"WARNING: Invalid ESPHome component path: {component_path}")
+                logger.warning("Invalid ESPHome component path: %s", component_path)
                 return
             
             device_name, component_name = parts
@@ -426,21 +484,21 @@ class AsyncStateManager:
             # Get the component proxy from the controller
             device_proxy = getattr(self.controller, device_name, None)
             if not device_proxy:
-                print(f"WARNING: ESPHome device not found: {device_name}")
+                logger.warning("ESPHome device not found: %s", device_name)
                 return
             
             component_proxy = getattr(device_proxy, component_name, None)
             if not component_proxy:
-                print(f"WARNING: ESPHome component not found: {component_path}")
+                logger.warning("ESPHome component not found: %s", component_path)
                 return
             
             # Verify the status method exists
             status_method = getattr(component_proxy, status_method_name, None)
             if not status_method or not callable(status_method):
-                print(f"WARNING: ESPHome status method {status_method_name} is not callable")
+                logger.warning("ESPHome status method %s is not callable", status_method_name)
                 return
             
-            print(f"DEBUG: Setting up ESPHome polling for {status_path}")
+            logger.debug("Setting up ESPHome polling for %s", status_path)
             
             # Create a callback for ESPHome status updates
             def make_esphome_callback(status_path_local):
@@ -452,26 +510,24 @@ class AsyncStateManager:
                             status_data = await status_method()
                             
                             if status_data is not None:
-                                print(f"ESPHome update: {status_path_local} = {status_data}")
+                                logger.debug("ESPHome update: %s = %s", status_path_local, status_data)
                                 # Update nested attributes
-                                self._set_nested_value(status_path_local, status_data)
+                                self._nested_setters[status_path_local](status_data)
                                 # Update external states dictionary
-                                new_states = {**self._external_states}
-                                new_states[status_path_local] = status_data
-                                self.external_states = new_states
+                                self._update_external_states({status_path_local: status_data})
                             
                             # Wait before next check (ESPHome components are polled less frequently)
                             await asyncio.sleep(getattr(self, 'esphome_poll_interval', 10))
                             
                         except Exception as e:
-                            print(f"Error polling ESPHome status {status_path_local}: {e}")
+                            logger.error("Error polling ESPHome status %s: %s", status_path_local, e)
                             await asyncio.sleep(5)  # Wait before retry
                         
                 return esphome_callback
             
             # Start monitoring task for this ESPHome status method
             callback_coro = make_esphome_callback(status_path)
-            monitor_task = asyncio.create_task(callback_coro())
+            monitor_task = self._loop.create_task(callback_coro())
             
             # Track the listener for cleanup
             self.event_listeners[status_path] = {
@@ -483,19 +539,17 @@ class AsyncStateManager:
             # Also track in esphome_monitor_tasks for easier cleanup
             self.esphome_monitor_tasks[status_path] = monitor_task
             
-            print(f"Started ESPHome polling listener for {status_path}")
+            logger.debug("Started ESPHome polling listener for %s", status_path)
             
         except Exception as e:
-            print(f"ERROR: Error setting up ESPHome listener for {status_path}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error setting up ESPHome listener for %s: %s", status_path, e)
 
     async def _setup_heartbeat_listeners(self):
         """
         Setup event-driven listeners for heartbeat responses.
         Each device manager has its own heartbeat response topic.
         """
-        print("Setting up heartbeat listeners...")
+        logger.info("Setting up heartbeat listeners...")
         
         # Track device managers we've already set up listeners for
         setup_managers = set()
@@ -515,21 +569,7 @@ class AsyncStateManager:
                 
             try:
                 # Create a callback for heartbeat updates
-                def make_heartbeat_callback(device_name_local, status_path_local):
-                    async def heartbeat_callback(heartbeat_data):
-                        if heartbeat_data is not None:
-                            print(f"Heartbeat update: {device_name_local} = {heartbeat_data}")
-                            # Update nested attributes
-                            self._set_nested_value(status_path_local, heartbeat_data)
-                            # Update external states dictionary
-                            new_states = {**self._external_states}
-                            new_states[status_path_local] = heartbeat_data
-                            self.external_states = new_states
-                        else:
-                            print(f"No heartbeat data received for {device_name_local}")
-                    return heartbeat_callback
-                
-                callback = make_heartbeat_callback(device_name, status_path)
+                callback = functools.partial(self._dispatch_status, status_path)
                 
                 # Use the device manager's heartbeat queue for continuous monitoring
                 wait_id = self._setup_heartbeat_continuous_wait(device_manager, callback)
@@ -542,60 +582,65 @@ class AsyncStateManager:
                 }
                 
                 setup_managers.add(manager_id)
-                print(f"Started heartbeat listener for {device_name}")
+                logger.debug("Started heartbeat listener for %s", device_name)
                 
             except Exception as e:
-                print(f"Error setting up heartbeat listener for {device_name}: {e}")
+                logger.error("Error setting up heartbeat listener for %s: %s", device_name, e)
     
     def _setup_heartbeat_continuous_wait(self, device_manager, callback):
         """
         Setup continuous monitoring of heartbeat responses for a device manager.
+        Responses from every manager are forwarded into one shared inbox that a
+        single monitor task consumes, instead of running one task per manager.
         Returns a unique wait ID for cleanup.
         """
-        import uuid
-        wait_id = str(uuid.uuid4())
+        wait_id = next(AsyncStateManager._wait_id_counter)
         
-        async def heartbeat_monitor_task():
+        def forward_heartbeat(heartbeat_data):
+            item = (wait_id, heartbeat_data)
             try:
-                while self.running:
-                    try:
-                        # Wait for heartbeat data from the device manager's queue
-                        heartbeat_data = await asyncio.wait_for(
-                            device_manager.heartbeat_queue.get(), 
-                            timeout=1.0  # Check stop condition periodically
-                        )
-                        
-                        try:
-                            if asyncio.iscoroutinefunction(callback):
-                                await callback(heartbeat_data)
-                            else:
-                                callback(heartbeat_data)
-                        except Exception as e:
-                            print(f"Error in heartbeat callback: {e}")
-                    
-                    except asyncio.TimeoutError:
-                        # Timeout is normal - just continue monitoring
-                        pass
-                        
-            except Exception as e:
-                print(f"Error in heartbeat monitor task: {e}")
+                self._heartbeat_inbox.put_nowait(item)
+            except asyncio.QueueFull:
+                # The monitor is behind; drop the oldest response to keep the newest
+                self._heartbeat_inbox.get_nowait()
+                self._heartbeat_inbox.put_nowait(item)
+        
+        device_manager.add_heartbeat_callback(forward_heartbeat)
         
-        # Start the monitoring task
-        task = asyncio.create_task(heartbeat_monitor_task())
+        # The callback never changes, so decide how to invoke it once
+        is_coro = asyncio.iscoroutinefunction(callback)
+        self._heartbeat_waits[wait_id] = (device_manager, forward_heartbeat, callback, is_coro)
         
-        # Store the task for cleanup (we'll clean it up in stop_continuous_refresh)
-        if not hasattr(self, '_heartbeat_monitor_tasks'):
-            self._heartbeat_monitor_tasks = {}
-        self._heartbeat_monitor_tasks[wait_id] = task
+        # Start the shared monitoring task on first use
+        if self._heartbeat_monitor_task is None:
+            self._heartbeat_monitor_task = self._loop.create_task(self._heartbeat_monitor())
         
         return wait_id
+    
+    async def _heartbeat_monitor(self):
+        """Dispatch heartbeat responses from all device managers to their callbacks"""
+        while True:
+            wait_id, heartbeat_data = await self._heartbeat_inbox.get()
+            
+            heartbeat_wait = self._heartbeat_waits.get(wait_id)
+            if heartbeat_wait is None:
+                continue
+            
+            _, _, callback, is_coro = heartbeat_wait
+            try:
+                if is_coro:
+                    await callback(heartbeat_data)
+                else:
+                    callback(heartbeat_data)
+            except Exception as e:
+                logger.error("Error in heartbeat callback: %s", e)
 
     async def refresh_all_data(self):
         """
         Manually refresh all data by sending commands and waiting for responses.
         This now includes MQTT components, ESPHome components, and heartbeat data.
         """
-        print("Manual refresh: requesting all device states...")
+        logger.info("Manual refresh: requesting all device states...")
         new_external_states = {}
         
         # Refresh MQTT component data
@@ -610,98 +655,94 @@ class AsyncStateManager:
         # Update external states (this will trigger queue update if changed)
         if new_external_states:
             self.external_states = new_external_states
-            print(f"Manual refresh completed: {len(new_external_states)} states updated")
+            logger.info("Manual refresh completed: %s states updated", len(new_external_states))
     
     async def _refresh_mqtt_component_data(self, new_external_states):
         """Refresh MQTT component-level data"""
-        # Filter for MQTT components only
-        mqtt_commands = [cmd for cmd in self.external_state_definitions 
-                        if cmd.get('type') != 'esphome']
+        # MQTT commands were grouped by device at init
+        device_commands = self._commands_by_device
         
-        if not mqtt_commands:
+        if not device_commands:
             return
         
-        print(f"Refreshing {len(mqtt_commands)} MQTT component states...")
-        
-        # Group commands by device to send them concurrently per device
-        device_commands = defaultdict(list)
+        logger.debug("Refreshing MQTT component states for %s devices...", len(device_commands))
         
-        for cmd_info in mqtt_commands:
-            device_name = cmd_info['component_path'].split('.')[0]
-            device_commands[device_name].append(cmd_info)
-        
-        # Process each device's commands concurrently
-        tasks = []
-        for device_name, commands in device_commands.items():
-            task = asyncio.create_task(
-                self._refresh_device_data(device_name, commands, new_external_states)
-            )
-            tasks.append(task)
-        
-        # Wait for all devices to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Process each device's commands concurrently and wait for all to complete
+        await self._run_concurrently(
+            self._refresh_device_data(device_name, commands, new_external_states)
+            for device_name, commands in device_commands.items()
+        )
     
     async def _refresh_esphome_component_data(self, new_external_states):
         """Refresh ESPHome component data"""
         # Filter for ESPHome components only
         esphome_commands = [cmd for cmd in self.external_state_definitions 
-                           if cmd.get('type') == 'esphome']
+                           if cmd.type == 'esphome']
         
         if not esphome_commands:
             return
         
-        print(f"Refreshing {len(esphome_commands)} ESPHome component states...")
+        logger.debug("Refreshing %s ESPHome component states...", len(esphome_commands))
         
-        # Process ESPHome commands
-        tasks = []
-        for cmd_info in esphome_commands:
-            task = asyncio.create_task(
-                self._refresh_single_esphome_status(cmd_info, new_external_states)
-            )
-            tasks.append(task)
-        
-        # Wait for all ESPHome status calls to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Process ESPHome commands and wait for all status calls to complete
+        await self._run_concurrently(
+            self._refresh_single_esphome_status(cmd_info, new_external_states)
+            for cmd_info in esphome_commands
+        )
     
     async def _refresh_single_esphome_status(self, cmd_info, new_external_states):
         """Refresh a single ESPHome status method"""
-        status_path = cmd_info['status_path']
-        status_method = cmd_info['status_method']
+        status_path = cmd_info.status_path
+        status_method = cmd_info.status_method
         
         try:
-            print(f"Refreshing ESPHome status: {status_path}")
+            logger.debug("Refreshing ESPHome status: %s", status_path)
             
             # Call the status method directly
             status_data = await status_method()
             
             if status_data is not None:
                 # Update nested attributes
-                self._set_nested_value(status_path, status_data)
+                self._nested_setters[status_path](status_data)
                 # Store in external states
                 new_external_states[status_path] = status_data
-                print(f"ESPHome status updated {status_path} = {status_data}")
+                logger.debug("ESPHome status updated %s = %s", status_path, status_data)
             else:
-                print(f"ESPHome status returned None for {status_path}")
+                logger.debug("ESPHome status returned None for %s", status_path)
                 new_external_states[status_path] = None
                 
         except Exception as e:
-            print(f"Error refreshing ESPHome status {status_path}: {e}")
+            logger.error("Error refreshing ESPHome status %s: %s", status_path, e)
             new_external_states[status_path] = None
     
     async def _refresh_heartbeat_data(self, new_external_states):
         """Refresh heartbeat data for all devices"""
-        print("Refreshing heartbeat data...")
-        
-        # Create tasks for all heartbeat requests
-        tasks = []
-        for heartbeat_info in self.heartbeat_definitions:
-            task = asyncio.create_task(
-                self._refresh_single_heartbeat(heartbeat_info, new_external_states)
-            )
-            tasks.append(task)
+        logger.debug("Refreshing heartbeat data...")
         
-        # Wait for all heartbeat requests to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Run all heartbeat requests and wait for them to complete
+        await self._run_concurrently(
+            self._refresh_single_heartbeat(heartbeat_info, new_external_states)
+            for heartbeat_info in self.heartbeat_definitions
+        )
+    
+    async def _run_concurrently(self, coros):
+        """
+        Run refresh coroutines concurrently and wait for all of them. Uses a
+        TaskGroup where available (Python 3.11+), falling back to gather.
+        """
+        if _HAS_TASK_GROUP:
+            async with asyncio.TaskGroup() as tg:
+                for coro in coros:
+                    tg.create_task(self._safe_run(coro))
+        else:
+            await asyncio.gather(*(self._safe_run(coro) for coro in coros))
+    
+    async def _safe_run(self, coro):
+        """Await a refresh coroutine, logging failures so siblings aren't cancelled"""
+        try:
+            await coro
+        except Exception as e:
+            logger.error("Error during refresh: %s", e)
     
     async def _refresh_single_heartbeat(self, heartbeat_info, new_external_states):
         """Refresh heartbeat data for a single device"""
@@ -709,19 +750,19 @@ class AsyncStateManager:
         status_path = heartbeat_info['status_path']
         
         try:
-            print(f"Requesting heartbeat for {device_name}...")
+            logger.debug("Requesting heartbeat for %s...", device_name)
             
             # Send heartbeat and wait for response
             heartbeat_data = await heartbeat_info['execute_and_wait_method'](timeout=5)
             
             if heartbeat_data is not None:
                 # Update nested attributes
-                self._set_nested_value(status_path, heartbeat_data)
+                self._nested_setters[status_path](heartbeat_data)
                 # Store in external states
                 new_external_states[status_path] = heartbeat_data
-                print(f"Heartbeat updated {status_path} = {heartbeat_data}")
+                logger.debug("Heartbeat updated %s = %s", status_path, heartbeat_data)
             else:
-                print(f"Heartbeat timeout for {device_name}")
+                logger.warning("Heartbeat timeout for %s", device_name)
                 # Store timeout/offline status
                 offline_status = {
                     "status": "offline",
@@ -731,7 +772,7 @@ class AsyncStateManager:
                 new_external_states[status_path] = offline_status
                 
         except Exception as e:
-            print(f"Error refreshing heartbeat for {device_name}: {e}")
+            logger.error("Error refreshing heartbeat for %s: %s", device_name, e)
             # Store error status
             error_status = {
                 "status": "error",
@@ -741,28 +782,35 @@ class AsyncStateManager:
             new_external_states[status_path] = error_status
     
     async def _refresh_device_data(self, device_name: str, commands: list, new_external_states: dict):
-        """Refresh data for a specific MQTT device"""
-        for cmd_info in commands:
+        """
+        Refresh data for a specific MQTT device. Commands run concurrently so
+        their status waits overlap, bounded by the max_inflight_refresh semaphore.
+        """
+        await self._run_concurrently(
+            self._refresh_one(cmd_info, new_external_states) for cmd_info in commands
+        )
+    
+    async def _refresh_one(self, cmd_info, new_external_states: dict):
+        """Execute a single data command and store its status response"""
+        status_path = cmd_info.status_path
+        
+        async with self._refresh_sem:
             try:
-                command_str = cmd_info['command_str']
-                status_method_name = cmd_info['status_method_name']
-                component_path = cmd_info['component_path']
-                status_path = cmd_info['status_path']
-                command_method_name = cmd_info['command_method_name']
+                command_str = cmd_info.command_str
+                status_method_name = cmd_info.status_method_name
+                component_path = cmd_info.component_path
+                command_method_name = cmd_info.command_method_name
                 
                 if not status_method_name:
                     # No status method, just execute command
-                    print(f"Executing command (no status): {command_str}")
-                    await cmd_info['command_method']()
-                    continue
+                    logger.debug("Executing command (no status): %s", command_str)
+                    await cmd_info.command_method()
+                    return
                 
                 # Get the component proxy
-                parts = component_path.split('.')
-                component_proxy = self.controller
-                for part in parts:
-                    component_proxy = getattr(component_proxy, part)
+                component_proxy = self._get_component_proxy(component_path)
                 
-                print(f"Executing command with status wait: {command_str}")
+                logger.debug("Executing command with status wait: %s", command_str)
                 
                 # Use the execute_and_wait method
                 status_data = await component_proxy.execute_and_wait_for_status(
@@ -773,60 +821,82 @@ class AsyncStateManager:
                 
                 if status_data is not None:
                     # Update our nested attributes for backward compatibility
-                    self._set_nested_value(status_path, status_data)
+                    self._nested_setters[status_path](status_data)
                     # Also store in the new external states dict
                     new_external_states[status_path] = status_data
-                    print(f"Updated {status_path} = {status_data}")
+                    logger.debug("Updated %s = %s", status_path, status_data)
                 else:
-                    print(f"Timeout waiting for {status_method_name}")
+                    logger.warning("Timeout waiting for %s", status_method_name)
                     new_external_states[status_path] = None
                     
             except Exception as e:
-                print(f"Error processing {cmd_info['command_str']}: {e}")
+                logger.error("Error processing %s: %s", cmd_info.command_str, e)
                 new_external_states[status_path] = None
     
-    async def _periodic_refresh_loop(self):
+    async def _wait_or_stop(self, period):
+        """Wait for period seconds, returning True early if a stop was requested"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=period)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _stale_loop(self):
         """
         Optional periodic refresh loop for devices that don't auto-publish status.
-        This now includes heartbeat monitoring and ESPHome polling.
+        This includes ESPHome polling.
         """
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                print("Periodic refresh check...")
-                # Refresh stale component data
+                logger.debug("Periodic refresh check...")
                 await self._refresh_stale_data()
-                # Refresh heartbeat data periodically
+            except Exception as e:
+                logger.error("Error during periodic refresh: %s", e)
+            
+            if await self._wait_or_stop(self.refresh_interval):
+                break
+    
+    async def _heartbeat_loop(self):
+        """
+        Periodic heartbeat refresh loop, running at its own cadence so heartbeat
+        intervals aren't tied to the component refresh interval.
+        """
+        while not self._stop_event.is_set():
+            try:
                 await self._refresh_periodic_heartbeats()
             except Exception as e:
-                print(f"Error during periodic refresh: {e}")
+                logger.error("Error during heartbeat refresh: %s", e)
             
-            # Sleep for the refresh interval
-            await asyncio.sleep(self.refresh_interval)
+            if await self._wait_or_stop(self.heartbeat_refresh_interval):
+                break
     
     async def _refresh_stale_data(self):
         """
         Refresh component data that hasn't been updated recently.
         This is a fallback for devices that don't auto-publish.
         """
-        current_time = time.time()
-        stale_threshold = getattr(self, 'stale_threshold', 30)  # 30 seconds default
-        
-        stale_commands = []
-        
-        for cmd_info in self.external_state_definitions:
-            status_path = cmd_info['status_path']
-            
-            # Only refresh critical sensors or those marked as needing periodic refresh
-            if self._needs_periodic_refresh(cmd_info):
-                stale_commands.append(cmd_info)
+        # Only refresh critical sensors or those marked as needing periodic refresh,
+        # popping from the heap until the oldest remaining entry is still fresh
+        now = time.monotonic()
+        heap = self._stale_heap
+        stale = []
+        while heap and now - heap[0][0] > self.stale_threshold:
+            _, seq, cmd_info = heapq.heappop(heap)
+            last_ts = self._last_update.get(cmd_info.status_path, float('-inf'))
+            if now - last_ts > self.stale_threshold:
+                stale.append((seq, cmd_info))
+            else:
+                # Updated by an event since it was queued, requeue at its real age
+                heapq.heappush(heap, (last_ts, seq, cmd_info))
+        stale_commands = [cmd_info for _, cmd_info in stale]
         
         if stale_commands:
-            print(f"Refreshing {len(stale_commands)} stale data points...")
+            logger.debug("Refreshing %s stale data points...", len(stale_commands))
             new_states = {}
             
             # Separate MQTT and ESPHome commands
-            mqtt_commands = [cmd for cmd in stale_commands if cmd.get('type') != 'esphome']
-            esphome_commands = [cmd for cmd in stale_commands if cmd.get('type') == 'esphome']
+            mqtt_commands = [cmd for cmd in stale_commands if cmd.type != 'esphome']
+            esphome_commands = [cmd for cmd in stale_commands if cmd.type == 'esphome']
             
             # Refresh MQTT commands
             if mqtt_commands:
@@ -838,48 +908,36 @@ class AsyncStateManager:
                     await self._refresh_single_esphome_status(cmd_info, new_states)
             
             if new_states:
-                current_states = {**self._external_states}
-                current_states.update(new_states)
-                self.external_states = current_states
+                self._update_external_states(new_states)
+            
+            # Requeue as refreshed now, even on failure, so a dead device is retried next threshold
+            now = time.monotonic()
+            for seq, cmd_info in stale:
+                heapq.heappush(heap, (now, seq, cmd_info))
     
     async def _refresh_periodic_heartbeats(self):
         """
         Periodically refresh heartbeat data to check device connectivity.
         """
-        heartbeat_refresh_interval = getattr(self, 'heartbeat_refresh_interval', 30)  # 30 seconds default
-        
-        # Check if it's time for heartbeat refresh
-        current_time = time.time()
-        if not hasattr(self, '_last_heartbeat_refresh'):
-            self._last_heartbeat_refresh = 0
+        logger.debug("Refreshing heartbeat data...")
+        new_states = {}
+        await self._refresh_heartbeat_data(new_states)
         
-        if current_time - self._last_heartbeat_refresh >= heartbeat_refresh_interval:
-            print("Refreshing heartbeat data...")
-            new_states = {}
-            await self._refresh_heartbeat_data(new_states)
-            
-            if new_states:
-                current_states = {**self._external_states}
-                current_states.update(new_states)
-                self.external_states = current_states
-                
-            self._last_heartbeat_refresh = current_time
+        if new_states:
+            self._update_external_states(new_states)
     
-    def _needs_periodic_refresh(self, cmd_info: dict) -> bool:
+    def _needs_periodic_refresh(self, cmd_info: CmdInfo) -> bool:
         """
         Determine if a command needs periodic refresh.
         Override this method to customize which devices need polling.
         """
         # ESPHome components benefit from periodic refresh since they don't have event-driven updates
-        if cmd_info.get('type') == 'esphome':
-            return True
-        
-        # Example: refresh temperature sensors every cycle
-        if 'temp' in cmd_info['status_path'].lower():
+        if cmd_info.type == 'esphome':
             return True
         
-        # Example: refresh critical status indicators
-        if 'heartbeat' in cmd_info['status_path'].lower():
+        # Example: refresh temperature sensors and critical status indicators every cycle
+        path = cmd_info.status_path_lower
+        if 'temp' in path or 'heartbeat' in path:
             return True
             
         # Most other MQTT devices rely on event-driven updates
@@ -888,48 +946,53 @@ class AsyncStateManager:
     async def start_continuous_refresh(self):
         """Start the event-driven state management"""
         if self.running:
-            print("Continuous refresh is already running")
+            logger.warning("Continuous refresh is already running")
             return
         
         self.running = True
+        self._stop_event.clear()
         
         # Start with an initial manual refresh to get current states
-        print("Starting with initial state refresh...")
+        logger.info("Starting with initial state refresh...")
         await self.refresh_all_data()
         
         # Start periodic refresh for devices that need it (ESPHome components benefit from this)
         if hasattr(self, 'refresh_interval') and self.refresh_interval > 0:
-            self.refresh_task = asyncio.create_task(self._periodic_refresh_loop())
-            print(f"Started periodic refresh task (interval: {self.refresh_interval}s)")
+            self._bg_tasks.append(self._loop.create_task(self._stale_loop()))
+            logger.info("Started periodic refresh task (interval: %ss)", self.refresh_interval)
+        
+        # Heartbeats are refreshed by their own task at their own interval
+        if self.heartbeat_refresh_interval > 0:
+            self._bg_tasks.append(self._loop.create_task(self._heartbeat_loop()))
+            logger.info("Started heartbeat refresh task (interval: %ss)", self.heartbeat_refresh_interval)
         
-        print("Event-driven state management started (MQTT + ESPHome)")
+        logger.info("Event-driven state management started (MQTT + ESPHome)")
     
     async def stop_continuous_refresh(self):
         """Stop the continuous refresh"""
         if not self.running:
-            print("Continuous refresh is not running")
+            logger.info("Continuous refresh is not running")
             return
         
-        print("Stopping state management...")
+        logger.info("Stopping state management...")
         self.running = False
+        self._stop_event.set()
         
-        # Stop periodic refresh task
-        if self.refresh_task and not self.refresh_task.done():
-            self.refresh_task.cancel()
-            try:
-                await self.refresh_task
-            except asyncio.CancelledError:
-                pass
+        # Stop periodic refresh tasks
+        for task in self._bg_tasks:
+            task.cancel()
+        await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        self._bg_tasks.clear()
         
         # Stop all MQTT component event listeners
-        print("Stopping MQTT component event listeners...")
+        logger.info("Stopping MQTT component event listeners...")
         for status_path, listener_info in self.event_listeners.items():
             try:
                 if listener_info.get('type') == 'mqtt':
                     component_proxy = listener_info['component_proxy']
                     wait_id = listener_info['wait_id']
                     await component_proxy.stop_continuous_wait(wait_id)
-                    print(f"Stopped MQTT listener for {status_path}")
+                    logger.debug("Stopped MQTT listener for %s", status_path)
                 elif listener_info.get('type') == 'esphome':
                     monitor_task = listener_info['monitor_task']
                     if not monitor_task.done():
@@ -938,12 +1001,12 @@ class AsyncStateManager:
                             await monitor_task
                         except asyncio.CancelledError:
                             pass
-                    print(f"Stopped ESPHome listener for {status_path}")
+                    logger.debug("Stopped ESPHome listener for %s", status_path)
             except Exception as e:
-                print(f"Error stopping listener for {status_path}: {e}")
+                logger.error("Error stopping listener for %s: %s", status_path, e)
         
         # Stop ESPHome monitor tasks
-        print("Stopping ESPHome monitor tasks...")
+        logger.info("Stopping ESPHome monitor tasks...")
         for status_path, task in self.esphome_monitor_tasks.items():
             if not task.done():
                 task.cancel()
@@ -953,34 +1016,96 @@ class AsyncStateManager:
                     pass
         self.esphome_monitor_tasks.clear()
         
-        # Stop heartbeat monitor tasks
-        if hasattr(self, '_heartbeat_monitor_tasks'):
-            print("Stopping heartbeat monitor tasks...")
-            for wait_id, task in self._heartbeat_monitor_tasks.items():
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-            self._heartbeat_monitor_tasks.clear()
+        # Stop the shared heartbeat monitor task
+        logger.info("Stopping heartbeat monitor task...")
+        for device_manager, forward_heartbeat, _, _ in self._heartbeat_waits.values():
+            device_manager.remove_heartbeat_callback(forward_heartbeat)
+        self._heartbeat_waits.clear()
+        
+        if self._heartbeat_monitor_task and not self._heartbeat_monitor_task.done():
+            self._heartbeat_monitor_task.cancel()
+            try:
+                await self._heartbeat_monitor_task
+            except asyncio.CancelledError:
+                pass
+        self._heartbeat_monitor_task = None
         
         self.event_listeners.clear()
         self.heartbeat_listeners.clear()
-        self.refresh_task = None
-        print("State management stopped (MQTT + ESPHome)")
+        logger.info("State management stopped (MQTT + ESPHome)")
     
     def is_refresh_running(self):
         """Check if continuous refresh is currently running"""
         return self.running
     
     def get_all_states(self):
-        """Return a dictionary of all current states"""
-        return {**self._external_states, **self._internal_states}
+        """
+        Return a read-only live view of all current states. Take dict() of
+        the result if a snapshot that won't change is needed.
+        """
+        return MappingProxyType(self._merged_states)
+
+    def _dispatch_status(self, status_path, status_data):
+        """
+        Apply an event-driven update (component status or heartbeat) for one path.
+        Listeners get a partial of this method bound to their path. It stays
+        synchronous so dispatchers call it inline instead of scheduling a task.
+        """
+        if status_data is None:
+            logger.debug("No data received for %s", status_path)
+            return
+        
+        logger.debug("Event-driven update: %s = %s", status_path, status_data)
+        # Update nested attributes
+        self._nested_setters[status_path](status_data)
+        # Update external states dictionary
+        self._set_external(status_path, status_data)
+
+    def _set_external(self, key, value):
+        """Set a single external state in place, emitting it only if the value changed"""
+        self._last_update[key] = time.monotonic()
+        current = self._external_states.get(key, _MISSING)
+        if current is value or current == value:
+            return
+        
+        self._external_states[key] = value
+        # Internal states take precedence in the merged view
+        if key not in self._internal_states:
+            self._merged_states[key] = value
+        self._put_state({key: value})
 
-    async def update_state_queue(self):
-        """Add current state to queue for websocket emission"""
-        await self.state_queue.put(self.get_all_states())
+    def _update_external_states(self, new_states):
+        """
+        Merge new_states into the external states in place and emit only the
+        keys whose values actually changed, instead of copying the whole dict.
+        """
+        self._last_update.update(dict.fromkeys(new_states, time.monotonic()))
+        changed = [key for key, value in new_states.items()
+                   if key not in self._external_states or self._external_states[key] != value]
+        if changed:
+            self._external_states.update(new_states)
+            for key in changed:
+                # Internal states take precedence in the merged view
+                if key not in self._internal_states:
+                    self._merged_states[key] = self._external_states[key]
+            self._emit_delta(changed)
+
+    def _emit_delta(self, keys):
+        """Add the current values of the given external state keys to the queue"""
+        self._put_state({key: self._external_states[key] for key in keys})
+
+    def _put_state(self, state):
+        """
+        Publish a state update. If the previous update hasn't been consumed
+        yet the new one is merged into it, so a burst is delivered once and
+        no key is lost. The dicts passed in are always fresh, so merging in
+        place is safe.
+        """
+        if self._latest_state is None:
+            self._latest_state = state
+        else:
+            self._latest_state.update(state)
+        self._state_event.set()
 
     async def set_state(self, key, value):
         """Set an internal state value"""
@@ -993,9 +1118,20 @@ class AsyncStateManager:
     @internal_states.setter
     def internal_states(self, value):
         if value != self._internal_states:
+            # Patch the merged view with only what changed
+            removed = self._internal_states.keys() - value.keys()
+            diff = {key: val for key, val in value.items()
+                    if key not in self._internal_states or self._internal_states[key] != val}
+            for key in removed:
+                # Fall back to the external value hidden by the internal one
+                if key in self._external_states:
+                    self._merged_states[key] = self._external_states[key]
+                else:
+                    del self._merged_states[key]
+            self._merged_states.update(diff)
             self._internal_states = value
-            # Schedule queue update
-            asyncio.create_task(self.update_state_queue())
+            # Queue a snapshot for websocket emission
+            self._put_state(self._merged_states.copy())
 
     @property
     def external_states(self):
@@ -1005,23 +1141,43 @@ class AsyncStateManager:
     @external_states.setter
     def external_states(self, value):
         """Set external states and trigger queue update if changed"""
+        self._last_update.update(dict.fromkeys(value, time.monotonic()))
         if value != self._external_states:
-            print(f"External states changed, updating queue")
+            logger.debug("External states changed, updating queue")
+            # Patch the merged view with only what changed; internal states take precedence
+            removed = self._external_states.keys() - value.keys()
+            diff = {key: val for key, val in value.items()
+                    if key not in self._internal_states
+                    and (key not in self._external_states or self._external_states[key] != val)}
+            for key in removed:
+                if key not in self._internal_states:
+                    del self._merged_states[key]
+            self._merged_states.update(diff)
             self._external_states = value
-            # Schedule queue update
-            asyncio.create_task(self.update_state_queue())
+            # Queue a snapshot for websocket emission
+            self._put_state(self._merged_states.copy())
 
     async def get_state_updates(self):
         """
         Async generator for state updates. Use this in your web layer.
         
+        Full refreshes yield a snapshot of all states, while event-driven and
+        periodic updates yield only the keys that changed, so consumers should
+        merge each update into their view rather than replace it.
+        
+        Updates that arrive while the consumer is busy are squashed into a
+        single pending update, so memory stays constant however far behind
+        the consumer falls and the latest value of every key is still delivered.
+        
         Usage:
             async for new_state in state_manager.get_state_updates():
                 await socketio.emit('state_update', serialize_state(new_state))
         """
         while True:
             try:
-                new_state = await self.state_queue.get()
+                await self._state_event.wait()
+                self._state_event.clear()
+                new_state, self._latest_state = self._latest_state, None
                 yield new_state
             except asyncio.CancelledError:
                 break
@@ -602,7 +602,7 @@ class AsyncServerDeviceManager:
         self.heartbeat_request_topic = f"{self.device_prefix}/heartbeat/request"
         self.heartbeat_response_topic = f"{self.device_prefix}/heartbeat/response"
         self.heartbeat_event = asyncio.Event()
-        self.heartbeat_queue = asyncio.Queue()
+        self.heartbeat_callbacks = []
         self.latest_heartbeat_data = None
         
     async def initialize(self):
@@ -676,16 +676,12 @@ class AsyncServerDeviceManager:
             print(f"Heartbeat response received: {payload}")
             self.latest_heartbeat_data = payload
             
-            # Put in queue for continuous listeners
-            try:
-                self.heartbeat_queue.put_nowait(payload)
-            except asyncio.QueueFull:
-                # Remove oldest item and add new one
+            # Notify registered heartbeat callbacks
+            for callback in self.heartbeat_callbacks:
                 try:
-                    self.heartbeat_queue.get_nowait()
-                    self.heartbeat_queue.put_nowait(payload)
-                except asyncio.QueueEmpty:
-                    pass
+                    callback(payload)
+                except Exception as e:
+                    print(f"Error in heartbeat callback: {e}")
             
             # Set event for one-time waiters
             self.heartbeat_event.set()
@@ -783,6 +779,15 @@ class AsyncServerDeviceManager:
         """Get the latest heartbeat response data"""
         return self.latest_heartbeat_data
     
+    def add_heartbeat_callback(self, callback):
+        """Add a callback for heartbeat responses"""
+        self.heartbeat_callbacks.append(callback)
+    
+    def remove_heartbeat_callback(self, callback):
+        """Remove a heartbeat callback"""
+        if callback in self.heartbeat_callbacks:
+            self.heartbeat_callbacks.remove(callback)
+    
     def _proxy_subscribe(self, topic: str, callback):
         """Subscribe to a topic with callback for component proxies"""
         if topic not in self.topic_callbacks:
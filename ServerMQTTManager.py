@@ -33,6 +33,8 @@ class ServerMQTTManager:
         self.heartbeat_request_topic = f"{self.device_prefix}/heartbeat/request"
         self.heartbeat_response_topic = f"{self.device_prefix}/heartbeat/response"
         self.heartbeat_callbacks = []
+        self.latest_heartbeat = None
+        self.heartbeat_event = asyncio.Event()  # Set when a response arrives, cleared on send
         
         logging.info(f"ServerMQTTManager created for prefix '{self.device_prefix}'")
     
@@ -106,6 +108,8 @@ class ServerMQTTManager:
             
             # Handle heartbeat responses
             if topic == self.heartbeat_response_topic:
+                self.latest_heartbeat = payload
+                self.heartbeat_event.set()
                 for callback in self.heartbeat_callbacks:
                     try:
                         if asyncio.iscoroutinefunction(callback):
@@ -215,12 +219,25 @@ class ServerMQTTManager:
     
     async def send_heartbeat(self):
         """Send heartbeat request to all devices"""
+        self.heartbeat_event.clear()
         payload = {
             "request_id": str(uuid.uuid4()),
             "timestamp": time.time()
         }
         return await self.publish(self.heartbeat_request_topic, payload)
     
+    async def wait_for_heartbeat(self, timeout: float = 2) -> bool:
+        """Wait for a heartbeat response since the last send_heartbeat"""
+        try:
+            await asyncio.wait_for(self.heartbeat_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def get_latest_heartbeat(self):
+        """Get the most recent heartbeat response payload"""
+        return self.latest_heartbeat
+    
     def add_heartbeat_callback(self, callback: Callable):
         """Add a callback for heartbeat responses"""
         self.heartbeat_callbacks.append(callback)
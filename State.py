@@ -1,9 +1,7 @@
 # CleanStateManager.py
 import asyncio
 import logging
-import time
-from typing import Dict, Any, List, Optional
-from MQTTDeviceProxy import MQTTComponentProxy
+from typing import Dict, Any, List
 
 class StateManager:
     """
@@ -28,8 +26,9 @@ class StateManager:
         # External states (device states)
         self._external_states = {}
         
-        # State update queue for websocket
-        self.state_queue = asyncio.Queue()
+        # State update queue for websocket; bounded since each entry is a full
+        # snapshot and a newer one supersedes anything older
+        self.state_queue = asyncio.Queue(maxsize=8)
         
         # Running flag
         self.running = False
@@ -479,7 +478,12 @@ class StateManager:
     async def _queue_state_update(self):
         """Queue current state for websocket emission"""
         all_states = self.get_all_states()
-        await self.state_queue.put(all_states)
+        try:
+            self.state_queue.put_nowait(all_states)
+        except asyncio.QueueFull:
+            # No consumer is keeping up, drop the oldest snapshot
+            self.state_queue.get_nowait()
+            self.state_queue.put_nowait(all_states)
     
     def get_all_states(self) -> Dict[str, Any]:
         """Get all current states"""
@@ -507,11 +511,29 @@ class StateManager:
         logging.warning(f"State '{key}' not found in internal or external states")
         return None
     
+    def get_states_bulk(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several state values in one call (internal first, then external)"""
+        internal = self._internal_states
+        external = self._external_states
+        return {
+            key: internal[key] if key in internal else external.get(key)
+            for key in keys
+        }
+    
     async def get_state_updates(self):
-        """Async generator for state updates"""
+        """
+        Async generator for state updates. Each entry is a full snapshot, so
+        anything queued behind the first one is drained and only the newest
+        is yielded.
+        """
         while True:
             try:
                 new_state = await self.state_queue.get()
+                while True:
+                    try:
+                        new_state = self.state_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
                 yield new_state
             except asyncio.CancelledError:
                 break
@@ -1,35 +1,25 @@
 import asyncio
 import logging
-from typing import Type, TypeVar
 import time
 
-SM = TypeVar("SM", bound="StinkMode")
+# States saved when stink mode starts and restored when it ends
+PREVIOUS_STATE_KEYS = [
+    "hvac.fan.fan_status",
+    "hvac.bathroom_valve.relay_status",
+    "hvac.avery_valve.relay_status",
+]
 
 class StinkMode:
-    _instance = None
-
-    def __new__(cls: Type[SM], *args, **kwargs) -> SM:
-        """
-        Ensures a single instance of this object (singleton pattern).
-        Note: In async context, singleton is less critical since we control instantiation
-        """
-        if not cls._instance:
-            cls._instance = super(StinkMode, cls).__new__(cls)
-        return cls._instance
-    
-    def __init__(self: SM, controller=None, state_manager=None, config=None) -> None:
+    def __init__(self, controller=None, state_manager=None, config=None) -> None:
         """
-        Run when initializing the object. Initialize queues and state.
-        Only initializes once due to singleton pattern.
+        Run when initializing the object. Initialize state and subscribe to the button.
+        The owner (AsyncCommandProcessor) creates and holds the single instance.
         """
-        if hasattr(self, '_initialized'):
-            return
-            
         if controller is None:
             raise ValueError("Controller must be provided on initialization")
         
         if config is None:
-            raise ValueError("Config must be provided on first initialization")
+            raise ValueError("Config must be provided on initialization")
 
         self.config = config
         self.controller = controller
@@ -39,60 +29,74 @@ class StinkMode:
 
         self.timeout = config.get('timeout', 300)
         self.device_name = config.get('device_name', 'stink_button')
-        self.timer_task = None
+        self.timer_handle = None  # Pending auto-off callback
+        self._auto_off_task = None
         self._toggle_in_progress = False
+        self._toggle_task = None
         
-        asyncio.create_task(self.button_monitor())
-
-        # Mark as initialized
-        self._initialized = True
+        # Devices are resolved on first use and cached until invalidate_device_cache()
+        self._stink_button = None
+        self._hvac = None
+        
+        self._subscribe_to_button()
 
-    async def button_monitor(self):
-        """Function for continuously monitoring button status and performing the appropriate action upon a press."""
+    def _subscribe_to_button(self):
+        """Subscribe to stink button presses so each press schedules a toggle"""
         
         # Get the stink button from your config
-        try:
-            stink_button = self.controller.get_device(self.device_name)
-            if not stink_button:
-                logging.error(f"❌ Device '{self.device_name}' not found")
-                return
-                
-            button_component = stink_button.button
-        except Exception as e:
-            logging.error(f"❌ Error getting stink button device: {e}")
+        devices = self._get_devices()
+        if devices is None:
             return
         
-        while True:
+        try:
+            button_component = devices[0].button
+            subscribe = getattr(button_component, 'subscribe_to_status_updates', None)
+            if subscribe is not None:
+                subscribe('pressed_status', self._on_press)
+            else:
+                button_component.wait_for_continuous('pressed_status', self._on_press)
+        except Exception as e:
+            logging.error(f"❌ Error subscribing to stink button: {e}")
+    
+    def _on_press(self, press_data):
+        """Button press callback; ignores presses while a toggle is still running"""
+        if press_data and not self._toggle_in_progress:
+            # Prevent overlapping toggles until this one finishes
+            self._toggle_in_progress = True
+            self._toggle_task = asyncio.create_task(self._guarded_toggle())
+    
+    async def _guarded_toggle(self):
+        try:
+            await self.toggle_stink_mode()
+        finally:
+            self._toggle_in_progress = False
+
+    def _get_devices(self):
+        """Return the cached (stink_button, hvac) devices, resolving them if needed"""
+        if self._stink_button is None or self._hvac is None:
             try:
-                # Wait for button press status (30 second timeout)
-                if await button_component.wait_for_status('pressed_status', timeout=30):
-                    # Get the button press data
-                    press_data = button_component.get_latest_status('pressed_status')
-                    
-                    if press_data and not self._toggle_in_progress:
-                        press_count = press_data.get('press_count', 0)
-                        timestamp = press_data.get('timestamp', 0)
-                        pin = press_data.get('pin', 0)
-                        
-                        # Prevent overlapping toggles by using await instead of create_task
-                        self._toggle_in_progress = True
-                        try:
-                            await self.toggle_stink_mode()
-                        finally:
-                            self._toggle_in_progress = False
-                    
-                    # Clear the event
-                    # button_component.clear_status_event('pressed_status')
-                    
-                else:
-                    logging.debug("⏰ No button press in the last 30 seconds")
-                    
-            except KeyboardInterrupt:
-                logging.info("Button monitoring stopped")
-                break
+                stink_button = self.controller.get_device(self.device_name)
+                if not stink_button:
+                    logging.error(f"❌ Device '{self.device_name}' not found")
+                    return None
+                
+                hvac = self.controller.get_device("hvac")
+                if not hvac:
+                    logging.error("❌ Device 'hvac' not found")
+                    return None
             except Exception as e:
-                logging.error(f"Error in button monitoring: {e}")
-                await asyncio.sleep(1)
+                logging.error(f"❌ Error getting devices: {e}")
+                return None
+            
+            self._stink_button = stink_button
+            self._hvac = hvac
+        
+        return self._stink_button, self._hvac
+    
+    def invalidate_device_cache(self):
+        """Drop the cached devices so they are looked up again, e.g. after a hot swap"""
+        self._stink_button = None
+        self._hvac = None
 
     async def toggle_stink_mode(self):
         """Toggle stink mode on or off"""
@@ -121,40 +125,35 @@ class StinkMode:
             return
         
         # Cancel any existing timer
-        if self.timer_task and not self.timer_task.done():
-            self.timer_task.cancel()
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
         
-        # Start new timer task (non-blocking)
-        self.timer_task = asyncio.create_task(self._auto_off_timer(self.timeout))
+        # Schedule the auto-off (non-blocking); a timer handle is lighter than a sleeping task
+        self.timer_handle = asyncio.get_running_loop().call_later(self.timeout, self._auto_off)
         logging.info(f"Stink mode auto-off timer started for {self.timeout} seconds")
 
-        timeout_end_time = time.time() + self.timeout
+        # Wall-clock epoch ms for the UI countdown, computed in integer nanoseconds
+        end_ms = time.time_ns() // 1_000_000 + int(self.timeout * 1000)
         try:
-            await self.state_manager.set_state('stink_mode_end', int(timeout_end_time * 1000))
+            await self.state_manager.set_state('stink_mode_end', end_ms)
         except Exception as e:
             logging.error(f"Error setting stink_mode timer end time: {e}")
             return
 
-        # Get devices with error handling
-        try:
-            stink_button = self.controller.get_device(self.device_name)
-            if not stink_button:
-                logging.error(f"❌ Device '{self.device_name}' not found")
-                return
-            
-            hvac = self.controller.get_device("hvac")
-            if not hvac:
-                logging.error("❌ Device 'hvac' not found")
-                return
-        except Exception as e:
-            logging.error(f"❌ Error getting devices: {e}")
+        # Get cached devices
+        devices = self._get_devices()
+        if devices is None:
             return
+        stink_button, hvac = devices
 
         # Store previous states before making changes
         try:
-            self.previous_states["fan_power"] = self.state_manager.get_state("hvac.fan.fan_status")["power"]
-            self.previous_states["bathroom_valve"] = self.state_manager.get_state("hvac.bathroom_valve.relay_status")["relay"]
-            self.previous_states["avery_valve"] = self.state_manager.get_state("hvac.avery_valve.relay_status")["relay"]
+            snapshot = self.state_manager.get_states_bulk(PREVIOUS_STATE_KEYS)
+            self.previous_states = {
+                "fan_power": snapshot["hvac.fan.fan_status"]["power"],
+                "bathroom_valve": snapshot["hvac.bathroom_valve.relay_status"]["relay"],
+                "avery_valve": snapshot["hvac.avery_valve.relay_status"]["relay"],
+            }
             logging.debug(f"Stored previous states: {self.previous_states}")
         except Exception as e:
             logging.error(f"❌ Error storing previous states: {e}")
@@ -165,15 +164,14 @@ class StinkMode:
                 "avery_valve": True
             }
 
-        # Apply stink mode settings
-        try:
-            await hvac.bathroom_valve.on()
-            await hvac.avery_valve.off()
-            await hvac.fan.set_power(power=10)
-            await stink_button.light.on()
+        # Apply stink mode settings; the commands are independent so send them together
+        if await self._run_commands(
+            ("bathroom_valve.on", lambda: hvac.bathroom_valve.on()),
+            ("avery_valve.off", lambda: hvac.avery_valve.off()),
+            ("fan.set_power", lambda: hvac.fan.set_power(power=10)),
+            ("light.on", lambda: stink_button.light.on()),
+        ):
             logging.info("✅ Stink mode activated successfully")
-        except Exception as e:
-            logging.error(f"❌ Error applying stink mode settings: {e}")
 
     async def stink_mode_off(self):
         """Turn off stink mode with better error handling"""
@@ -185,8 +183,9 @@ class StinkMode:
             return
         
         # Cancel the timer if it's running
-        if self.timer_task and not self.timer_task.done():
-            self.timer_task.cancel()
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
             logging.info("Stink mode timer cancelled")
 
         try:
@@ -195,50 +194,44 @@ class StinkMode:
             logging.error(f"Error setting stink_mode timer end time to None: {e}")
             return
 
-        # Get devices with error handling
-        try:
-            stink_button = self.controller.get_device(self.device_name)
-            if not stink_button:
-                logging.error(f"❌ Device '{self.device_name}' not found")
-                return
-            
-            hvac = self.controller.get_device("hvac")
-            if not hvac:
-                logging.error("❌ Device 'hvac' not found")
-                return
-        except Exception as e:
-            logging.error(f"❌ Error getting devices: {e}")
+        # Get cached devices
+        devices = self._get_devices()
+        if devices is None:
             return
+        stink_button, hvac = devices
 
         # Restore previous states
-        try:
-            # Fix the valve logic - restore to actual previous states
-            if self.previous_states.get("bathroom_valve") is True:
-                await hvac.bathroom_valve.on()
-            else:
-                await hvac.bathroom_valve.off()
-
-            if self.previous_states.get("avery_valve") is True:
-                await hvac.avery_valve.on()
-            else:
-                await hvac.avery_valve.off()
-
-            await hvac.fan.set_power(power=self.previous_states.get("fan_power", 5))
-            await stink_button.light.off()
-            
+        bathroom_on = self.previous_states.get("bathroom_valve") is True
+        avery_on = self.previous_states.get("avery_valve") is True
+        if await self._run_commands(
+            ("bathroom_valve", lambda: hvac.bathroom_valve.on() if bathroom_on else hvac.bathroom_valve.off()),
+            ("avery_valve", lambda: hvac.avery_valve.on() if avery_on else hvac.avery_valve.off()),
+            ("fan.set_power", lambda: hvac.fan.set_power(power=self.previous_states.get("fan_power", 5))),
+            ("light.off", lambda: stink_button.light.off()),
+        ):
             logging.info("✅ Stink mode deactivated successfully")
             logging.debug(f"Restored states: {self.previous_states}")
-        except Exception as e:
-            logging.error(f"❌ Error restoring previous states: {e}")
+    
+    async def _run_commands(self, *commands):
+        """
+        Run (name, command) device commands concurrently, logging each failure.
+        Each command is a zero-argument callable returning a coroutine; it is
+        called inside the gather, so a missing device or component fails only
+        that command. Returns True if all of them succeeded.
+        """
+        async def run(command):
+            return await command()
         
-    async def _auto_off_timer(self, seconds):
-        """Internal timer function that waits then turns off"""
-        try:
-            await asyncio.sleep(seconds)
-            # Timer completed without being cancelled
-            logging.info(f"Timer expired after {seconds} seconds - auto turning off")
-            await self.stink_mode_off()
-        except asyncio.CancelledError:
-            # Timer was cancelled (system turned off manually)
-            logging.debug("Timer was cancelled")
-            raise  # Re-raise so the task knows it was cancelled
\ No newline at end of file
+        results = await asyncio.gather(*(run(command) for _, command in commands), return_exceptions=True)
+        ok = True
+        for (name, _), result in zip(commands, results):
+            if isinstance(result, Exception):
+                logging.error(f"❌ Error running {name}: {result}")
+                ok = False
+        return ok
+        
+    def _auto_off(self):
+        """Timer callback that turns stink mode off once the timeout expires"""
+        self.timer_handle = None
+        logging.info(f"Timer expired after {self.timeout} seconds - auto turning off")
+        self._auto_off_task = asyncio.create_task(self.stink_mode_off())
@@ -1,9 +1,15 @@
 import adafruit_sht31d
 import board
 from Component import Component, status, command
+from concurrent.futures import ThreadPoolExecutor
+import logging
 import time
 
 class TemperatureSensor(Component):
+    # Commands run on the MQTT network thread, so the blocking I2C read is handed to
+    # a worker. One worker keeps reads on the shared bus serialized.
+    _read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="therm-i2c")
+
     def __init__(self, name=None, device_name=None):
         self._i2c = board.I2C()  
         self._sensor = adafruit_sht31d.SHT31D(self._i2c)
@@ -15,11 +21,23 @@ class TemperatureSensor(Component):
 
     @command(data_command=True, events=['temp_status'])
     def read_temp(self, units="f"):
-        self.temperature = self._sensor.temperature
-        self.humidity = self._sensor.relative_humidity
+        self._read_executor.submit(self._read_and_publish, units)
+
+    def _read_sync(self):
+        return self._sensor.temperature, self._sensor.relative_humidity
+
+    def _read_and_publish(self, units):
+        try:
+            temperature, humidity = self._read_sync()
+        except Exception as e:
+            logging.error(f"Error reading temperature sensor {self.name}: {e}")
+            return
 
         if units == "f" or units == "F":
-            self.temperature = self.temperature * 1.8 + 32
+            temperature = temperature * 1.8 + 32
+
+        self.temperature = temperature
+        self.humidity = humidity
         
         self.trigger_event('temp_status')
         
@@ -4,6 +4,11 @@
 import asyncio
 import logging
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Not available on Windows, the default event loop is used
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -147,4 +152,6 @@ async def test_new_system():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(test_new_system())
\ No newline at end of file
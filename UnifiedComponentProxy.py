@@ -16,10 +16,25 @@ class UnifiedComponentProxy:
         self.component_name = component_name
         self.base_component = base_component
         
-        # Event management for async waiting
+        # Method names never change, so keep them as sets for O(1) membership tests
+        self._command_names = frozenset(base_component.get_command_methods())
+        self._status_names = frozenset(base_component.get_status_methods())
+        
+        # Update mode is fixed per component type
+        self._requires_polling = base_component.requires_polling()
+        self._supports_events = base_component.supports_event_updates()
+        
+        # Latest value and update count per status. Waiters block on the status's
+        # current event, which is set and replaced on every update, so each
+        # waiter sees the next update without anyone having to clear it
         self.status_events: Dict[str, asyncio.Event] = {}
-        self.status_queues: Dict[str, asyncio.Queue] = {}
-        self.continuous_listeners: Dict[str, asyncio.Task] = {}
+        self.status_latest: Dict[str, Any] = {}
+        self.status_seq: Dict[str, int] = {}
+        
+        # One dispatcher task per status, fanning updates out to its waits
+        self.continuous_listeners: Dict[str, asyncio.Task] = {}  # status name -> dispatcher
+        self._subscribers: Dict[str, Dict[str, tuple]] = {}  # status name -> wait ID -> callbacks
+        self._wait_status: Dict[str, str] = {}  # wait ID -> status name
         
         # Create proxy methods
         self._create_proxy_methods()
@@ -38,37 +53,42 @@ class UnifiedComponentProxy:
         await self.base_component.disconnect()
     
     def _create_proxy_methods(self):
-        """Create proxy methods for all commands"""
-        for command_name in self.base_component.get_command_methods():
-            # Create a closure to capture the command name
-            def make_method(cmd_name):
-                async def proxy_method(**kwargs):
-                    return await self.base_component.execute_command(cmd_name, **kwargs)
-                return proxy_method
-            
-            # Add the method to this instance
-            setattr(self, command_name, make_method(command_name))
-        
-        # Also create methods for status getters
-        for status_name in self.base_component.get_status_methods():
-            # Create async event and queue for this status
+        """Create per-instance status state; command and getter methods resolve in __getattr__"""
+        for status_name in self._status_names:
+            # Create async event and update counter for this status
             self.status_events[status_name] = asyncio.Event()
-            self.status_queues[status_name] = asyncio.Queue(maxsize=100)
-            
-            # Create getter method
-            def make_status_getter(status):
-                async def get_status():
-                    return await self.base_component.get_status(status)
-                return get_status
-            
-            # Add getter method (optional - for direct access)
-            setattr(self, f"get_{status_name}", make_status_getter(status_name))
+            self.status_seq[status_name] = 0
+    
+    def __getattr__(self, name: str):
+        """
+        Resolve command methods and get_<status> getters on first use. The
+        created method is stored on the instance so later lookups skip this.
+        """
+        # Private names and anything looked up before the name sets exist are never proxied
+        if name.startswith('_') or '_status_names' not in self.__dict__:
+            raise AttributeError(name)
+        base_component = self.base_component
+        
+        if name in self._command_names:
+            async def proxy_method(**kwargs):
+                return await base_component.execute_command(name, **kwargs)
+            method = proxy_method
+        elif name.startswith('get_') and name[4:] in self._status_names:
+            status = name[4:]
+            async def get_status():
+                return await base_component.get_status(status)
+            method = get_status
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        setattr(self, name, method)
+        return method
     
     def _setup_status_monitoring(self):
         """Setup monitoring for status updates"""
-        if self.base_component.supports_event_updates():
+        if self._supports_events:
             # For event-driven components (MQTT), subscribe to updates
-            for status_name in self.base_component.get_status_methods():
+            for status_name in self._status_names:
                 self.base_component.subscribe_to_status(
                     status_name,
                     lambda value, s=status_name: self._handle_status_update(s, value)
@@ -78,35 +98,29 @@ class UnifiedComponentProxy:
     
     def _handle_status_update(self, status_name: str, value: Any):
         """Handle incoming status updates"""
-        # Update queues and events
-        if status_name in self.status_events:
-            # Set the event
-            self.status_events[status_name].set()
-            
-            # Add to queue
-            try:
-                self.status_queues[status_name].put_nowait(value)
-            except asyncio.QueueFull:
-                # Remove oldest and add new
-                try:
-                    self.status_queues[status_name].get_nowait()
-                    self.status_queues[status_name].put_nowait(value)
-                except:
-                    pass
+        event = self.status_events.get(status_name)
+        if event is None:
+            return
+        
+        # Store the latest value, then wake everyone waiting on this update
+        self.status_latest[status_name] = value
+        self.status_seq[status_name] += 1
+        self.status_events[status_name] = asyncio.Event()
+        event.set()
     
     async def execute_and_wait_for_status(self, command_name: str, status_name: str, timeout: float = 10) -> Any:
         """Execute a command and wait for the associated status update"""
-        if status_name not in self.status_events:
+        if status_name not in self._status_names:
             raise ValueError(f"No status method '{status_name}' found")
         
-        # Clear the event before executing
-        self.status_events[status_name].clear()
+        # Grab the pending update's event before executing
+        event = self.status_events[status_name]
         
         # Execute the command
         await self.base_component.execute_command(command_name)
         
         # For components that support direct status query (like ESPHome)
-        if self.base_component.requires_polling():
+        if self._requires_polling:
             # Wait a bit for command to process
             await asyncio.sleep(0.5)
             # Get status directly
@@ -114,93 +128,145 @@ class UnifiedComponentProxy:
         
         # For event-driven components (MQTT), wait for the event
         try:
-            await asyncio.wait_for(
-                self.status_events[status_name].wait(),
-                timeout=timeout
-            )
+            await asyncio.wait_for(event.wait(), timeout=timeout)
             return self.base_component.get_cached_status(status_name)
         except asyncio.TimeoutError:
             return None
     
     async def wait_for_status(self, status_name: str, timeout: float = None) -> bool:
         """Wait for a status update event"""
-        if status_name not in self.status_events:
+        if status_name not in self._status_names:
             raise ValueError(f"No status method '{status_name}' found")
         
-        self.status_events[status_name].clear()
+        event = self.status_events[status_name]
         
         try:
             if timeout:
-                await asyncio.wait_for(self.status_events[status_name].wait(), timeout=timeout)
+                await asyncio.wait_for(event.wait(), timeout=timeout)
             else:
-                await self.status_events[status_name].wait()
+                await event.wait()
             return True
         except asyncio.TimeoutError:
             return False
     
-    def wait_for_continuous(self, status_name: str, callback: Callable, stop_condition: Callable = None) -> str:
-        """Setup continuous monitoring of a status with callback"""
-        if status_name not in self.status_queues:
+    def wait_for_continuous(self, status_name: str, callback: Callable, stop_condition: Callable = None,
+                            poll_interval: float = 5.0, max_poll_interval: float = 30.0) -> str:
+        """
+        Setup continuous monitoring of a status with callback. All waits on a
+        status share one dispatcher task that hands each update to every callback.
+        Polling components are read every poll_interval seconds, backing off by
+        doubling up to max_poll_interval while the value stays the same; the
+        intervals given by the wait that starts the dispatcher are used.
+        """
+        if status_name not in self._status_names:
             raise ValueError(f"No status method '{status_name}' found")
         
         wait_id = str(uuid.uuid4())
         
-        async def continuous_monitor():
-            queue = self.status_queues[status_name]
-            
-            while True:
-                try:
-                    # For polling components, manually check for updates
-                    if self.base_component.requires_polling():
-                        old_value = self.base_component.get_cached_status(status_name)
-                        new_value = await self.base_component.get_status(status_name)
-                        
-                        if new_value != old_value:
-                            self._handle_status_update(status_name, new_value)
-                            
-                            if asyncio.iscoroutinefunction(callback):
-                                await callback(new_value)
-                            else:
-                                callback(new_value)
-                        
-                        await asyncio.sleep(5)  # Poll interval
+        # The callbacks never change, so decide how to invoke them once
+        self._subscribers.setdefault(status_name, {})[wait_id] = (
+            callback, asyncio.iscoroutinefunction(callback),
+            stop_condition, asyncio.iscoroutinefunction(stop_condition)
+        )
+        self._wait_status[wait_id] = status_name
+        
+        # Start the status's dispatcher on its first wait
+        if status_name not in self.continuous_listeners:
+            self.continuous_listeners[status_name] = asyncio.create_task(
+                self._dispatch_status(status_name, self.status_seq[status_name],
+                                      poll_interval, max_poll_interval)
+            )
+        
+        return wait_id
+    
+    async def _dispatch_status(self, status_name: str, seen: int,
+                               poll_interval: float, max_poll_interval: float):
+        """
+        Deliver updates of one status to its subscribed waits until none are left.
+        seen is the update count when the dispatcher was started, so updates that
+        land before the task first runs are still delivered.
+        """
+        subscribers = self._subscribers[status_name]
+        interval = poll_interval
+        
+        while subscribers:
+            try:
+                # For polling components, manually check for updates
+                if self._requires_polling:
+                    old_value = self.base_component.get_cached_status(status_name)
+                    new_value = await self.base_component.get_status(status_name)
+                    
+                    if new_value != old_value:
+                        self._handle_status_update(status_name, new_value)
+                        await self._deliver(subscribers, new_value)
+                        interval = poll_interval
                     else:
-                        # For event-driven components, wait for queue updates
-                        value = await asyncio.wait_for(queue.get(), timeout=1.0)
-                        
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(value)
-                        else:
-                            callback(value)
+                        interval = min(interval * 2, max_poll_interval)
                     
-                    # Check stop condition
-                    if stop_condition and stop_condition():
-                        break
-                        
-                except asyncio.TimeoutError:
-                    pass
-                except asyncio.CancelledError:
-                    break
+                    await asyncio.sleep(interval)
+                else:
+                    # For event-driven components, wait for the next update unless one
+                    # arrived since the last pass; bursts collapse to the latest value.
+                    # No timeout: the last stop_continuous_wait cancels the task directly
+                    if self.status_seq[status_name] == seen:
+                        await self.status_events[status_name].wait()
+                    seen = self.status_seq[status_name]
+                    await self._deliver(subscribers, self.status_latest[status_name])
+                    
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"Error in continuous monitor for {status_name}: {e}")
+                await asyncio.sleep(1)
+        
+        if self.continuous_listeners.get(status_name) is asyncio.current_task():
+            del self.continuous_listeners[status_name]
+    
+    async def _deliver(self, subscribers: Dict[str, tuple], value: Any):
+        """Call every subscribed wait with value, then drop those whose stop condition is met"""
+        current = list(subscribers.items())
+        
+        pending = []
+        for wait_id, (callback, is_async_cb, _, _) in current:
+            if is_async_cb:
+                pending.append(callback(value))
+            else:
+                try:
+                    callback(value)
                 except Exception as e:
-                    logging.error(f"Error in continuous monitor: {e}")
-                    await asyncio.sleep(1)
+                    logging.error(f"Error in continuous wait callback {wait_id}: {e}")
         
-        # Start monitoring task
-        task = asyncio.create_task(continuous_monitor())
-        self.continuous_listeners[wait_id] = task
+        if pending:
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logging.error(f"Error in continuous wait callback: {result}")
         
-        return wait_id
+        # Check stop conditions
+        for wait_id, (_, _, stop_condition, is_async_stop) in current:
+            if stop_condition and wait_id in subscribers:
+                if await stop_condition() if is_async_stop else stop_condition():
+                    del subscribers[wait_id]
+                    self._wait_status.pop(wait_id, None)
     
     async def stop_continuous_wait(self, wait_id: str):
         """Stop a continuous wait by ID"""
-        if wait_id in self.continuous_listeners:
-            task = self.continuous_listeners[wait_id]
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            del self.continuous_listeners[wait_id]
+        status_name = self._wait_status.pop(wait_id, None)
+        if status_name is None:
+            return
+        
+        subscribers = self._subscribers[status_name]
+        subscribers.pop(wait_id, None)
+        
+        # Stop the dispatcher with its last wait, unless this is being called from it
+        if not subscribers:
+            task = self.continuous_listeners.get(status_name)
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                self.continuous_listeners.pop(status_name, None)
     
     async def stop_all_continuous_waits(self):
         """Stop all continuous waits"""
@@ -212,6 +278,8 @@ class UnifiedComponentProxy:
             await asyncio.gather(*tasks, return_exceptions=True)
         
         self.continuous_listeners.clear()
+        self._subscribers.clear()
+        self._wait_status.clear()
     
     def get_latest_status(self, status_name: str) -> Any:
         """Get the latest cached status value"""
@@ -6,17 +6,34 @@ Repeatedly calls device_info() to test connection stability
 
 import asyncio
 import logging
+import logging.handlers
 import time
 from datetime import datetime
 from aioesphomeapi import APIClient, APIConnectionError
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Not available on Windows, the default event loop is used
+
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# basicConfig only formats the handlers it is given, so the buffered file handler needs its own
+_file_handler = logging.FileHandler('esphome_test.log')
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('esphome_test.log')
+        # Buffer file writes; errors (and logging.shutdown at exit) flush the batch
+        logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=_file_handler,
+        )
     ]
 )
 
@@ -30,7 +47,19 @@ class ESPHomeConnectionTester:
         self.test_count = 0
         self.success_count = 0
         self.failure_count = 0
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        
+        # device_info() is static per connection, so it is fetched once per client
+        self._cached_info = None
+        self._cached_info_conn_id = None
+        # Bound ping() of the current client, or None when the client has no ping
+        self._ping = None
+        
+        # One reconnect at a time, with exponential backoff between attempts
+        self._reconnect_sem = asyncio.Semaphore(1)
+        self._backoff = 1.0
+        
+        self._last_stats = time.monotonic()
         
     async def connect(self):
         """Initial connection to the device"""
@@ -38,6 +67,7 @@ class ESPHomeConnectionTester:
             self.client = APIClient(self.host, self.port, self.password)
             await self.client.connect(login=True)
             self.connected = True
+            self._ping = getattr(self.client, 'ping', None)
             
             # Get initial device info to verify connection
             # device_info = await self.client.device_info()
@@ -46,11 +76,11 @@ class ESPHomeConnectionTester:
             return True
             
         except APIConnectionError as e:
-            logging.error(f"❌ Failed to connect to ESPHome device {self.host}: {e}")
+            logging.error("❌ Failed to connect to ESPHome device %s: %s", self.host, e)
             self.connected = False
             return False
         except Exception as e:
-            logging.error(f"❌ Unexpected error connecting to {self.host}: {e}")
+            logging.error("❌ Unexpected error connecting to %s: %s", self.host, e)
             self.connected = False
             return False
     
@@ -59,52 +89,75 @@ class ESPHomeConnectionTester:
         self.test_count += 1
         
         try:
-            start_time = time.time()
-            device_info = await self.client.device_info()
-            response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            start_ns = time.perf_counter_ns()
+            if (self._ping is not None and self._cached_info is not None
+                    and self._cached_info_conn_id == id(self.client)):
+                # Metadata is already cached; use the cheaper ping as the liveness check
+                call = "ping()"
+                device_info = self._cached_info
+                await self._ping()
+            else:
+                call = "device_info()"
+                device_info = await self.client.device_info()
+                self._cached_info = device_info
+                self._cached_info_conn_id = id(self.client)
+            response_time = (time.perf_counter_ns() - start_ns) / 1e6  # Convert to milliseconds
             
             self.success_count += 1
-            logging.info(f"✅ Test #{self.test_count}: device_info() success "
-                        f"(Response time: {response_time:.1f}ms) - {device_info.name}")
+            logging.info("✅ Test #%d: %s success (Response time: %.1fms) - %s",
+                         self.test_count, call, response_time, device_info.name)
             return True, response_time
             
         except APIConnectionError as e:
             self.failure_count += 1
-            logging.error(f"❌ Test #{self.test_count}: APIConnectionError - {e}")
+            logging.error("❌ Test #%d: APIConnectionError - %s", self.test_count, e)
             self.connected = False
             return False, None
             
         except Exception as e:
             self.failure_count += 1
-            logging.error(f"❌ Test #{self.test_count}: Unexpected error - {e}")
+            logging.error("❌ Test #%d: Unexpected error - %s", self.test_count, e)
             return False, None
     
     async def reconnect(self):
         """Attempt to reconnect after a failure"""
-        logging.info("🔄 Attempting to reconnect...")
-        
-        # Clean up old client
-        if self.client:
-            try:
-                await self.client.disconnect()
-            except:
-                pass  # Ignore errors during cleanup
+        failed_client = self.client
         
-        # Create new client and connect
-        return await self.connect()
+        async with self._reconnect_sem:
+            if self.connected and self.client is not failed_client:
+                return True  # Another task already reconnected while we waited
+            
+            logging.info("🔄 Attempting to reconnect in %.0fs...", self._backoff)
+            await asyncio.sleep(self._backoff)
+            self._backoff = min(self._backoff * 2, 30)
+            
+            # The new connection gets fresh device info
+            self._cached_info = None
+            self._cached_info_conn_id = None
+            
+            # Clean up old client
+            if self.client:
+                try:
+                    await self.client.disconnect()
+                except Exception:
+                    pass  # Ignore errors during cleanup
+            
+            # Create new client and connect
+            ok = await self.connect()
+            if ok:
+                self._backoff = 1.0
+            return ok
     
     def print_stats(self):
         """Print current test statistics"""
-        runtime = time.time() - self.start_time
+        runtime = time.perf_counter() - self.start_time
         success_rate = (self.success_count / self.test_count * 100) if self.test_count > 0 else 0
         
-        logging.info(f"📊 Stats after {runtime:.0f}s: "
-                    f"Tests: {self.test_count}, "
-                    f"Success: {self.success_count}, "
-                    f"Failures: {self.failure_count}, "
-                    f"Success Rate: {success_rate:.1f}%")
+        logging.info("📊 Stats after %.0fs: Tests: %d, Success: %d, Failures: %d, Success Rate: %.1f%%",
+                     runtime, self.test_count, self.success_count, self.failure_count, success_rate)
     
-    async def run_test(self, test_interval=30, max_tests=None, reconnect_on_failure=True):
+    async def run_test(self, test_interval=30, max_tests=None, reconnect_on_failure=True, concurrency=1,
+                       stats_interval=60.0):
         """
         Run the continuous test
         
@@ -112,11 +165,14 @@ class ESPHomeConnectionTester:
             test_interval: Seconds between tests (default 30)
             max_tests: Maximum number of tests to run (None for infinite)
             reconnect_on_failure: Whether to attempt reconnection after failures
+            concurrency: Number of overlapping device_info() calls per tick (default 1)
+            stats_interval: Minimum seconds between periodic stats lines (default 60)
         """
         logging.info(f"🚀 Starting ESPHome device_info() test for {self.host}:{self.port}")
         logging.info(f"   Test interval: {test_interval}s")
         logging.info(f"   Max tests: {max_tests if max_tests else 'unlimited'}")
         logging.info(f"   Reconnect on failure: {reconnect_on_failure}")
+        logging.info(f"   Concurrency: {concurrency}")
         
         # Initial connection
         if not await self.connect():
@@ -125,19 +181,26 @@ class ESPHomeConnectionTester:
         
         try:
             while max_tests is None or self.test_count < max_tests:
-                # Run the test
-                success, response_time = await self.test_device_info()
+                # Run a batch of overlapping tests; the tick succeeds if any of them did
+                batch = concurrency if max_tests is None else min(concurrency, max_tests - self.test_count)
+                results = await asyncio.gather(
+                    *(self.test_device_info() for _ in range(batch)),
+                    return_exceptions=True
+                )
+                success = any(not isinstance(result, BaseException) and result[0] for result in results)
                 
-                # Handle failure
+                # Handle failure, reconnecting only if every probe in the batch failed
                 if not success and reconnect_on_failure:
                     reconnect_success = await self.reconnect()
                     if reconnect_success:
                         # Try the test again after successful reconnection
                         success, response_time = await self.test_device_info()
                 
-                # Print stats every 10 tests or after failures
-                if self.test_count % 10 == 0 or not success:
+                # Print stats at most every stats_interval seconds, or after failures
+                now = time.monotonic()
+                if not success or now - self._last_stats >= stats_interval:
                     self.print_stats()
+                    self._last_stats = now
                 
                 # Wait before next test (unless it's the last test)
                 if max_tests is None or self.test_count < max_tests:
@@ -171,19 +234,24 @@ async def main():
     TEST_INTERVAL = 5       # Seconds between tests
     MAX_TESTS = None         # None for unlimited, or set a number like 100
     RECONNECT_ON_FAILURE = True  # Whether to try reconnecting after failures
+    CONCURRENCY = 1          # Overlapping device_info() calls per test tick
     
     # Create and run the tester
     tester = ESPHomeConnectionTester(HOST, PORT, PASSWORD)
     await tester.run_test(
         test_interval=TEST_INTERVAL,
         max_tests=MAX_TESTS,
-        reconnect_on_failure=RECONNECT_ON_FAILURE
+        reconnect_on_failure=RECONNECT_ON_FAILURE,
+        concurrency=CONCURRENCY
     )
 
 if __name__ == "__main__":
     print("ESPHome Connection Stability Tester")
     print("=" * 40)
     
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -3,8 +3,19 @@
 
 import asyncio
 import logging
+import sys
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader  # PyYAML built without libyaml
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Not available on Windows, the default event loop is used
+
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 async def debug_heartbeat():
@@ -35,24 +46,35 @@ async def debug_heartbeat():
         else:
             print("   ERROR: Controller has no mqtt_managers attribute!")
         
-        # 3. Send test heartbeats directly
+        # 3. Send test heartbeats directly, probing every manager at once
         print("\n3. Sending test heartbeats directly...")
-        for prefix, manager in controller.mqtt_managers.items():
-            print(f"\n   Sending heartbeat for {prefix}...")
+        
+        async def probe(prefix, manager):
             result = await manager.send_heartbeat()
-            print(f"   Send result: {result}")
             
-            # Wait for response
-            await asyncio.sleep(2)
+            # Wait for response, up to 2 seconds
+            await manager.wait_for_heartbeat(timeout=2)
             
             # Check if we got a response
-            latest = manager.get_latest_heartbeat()
+            return prefix, result, manager.get_latest_heartbeat()
+        
+        results = await asyncio.gather(
+            *(probe(prefix, manager) for prefix, manager in controller.mqtt_managers.items()),
+            return_exceptions=True
+        )
+        for prefix, result in zip(controller.mqtt_managers, results):
+            print(f"\n   Heartbeat for {prefix}:")
+            if isinstance(result, Exception):
+                print(f"   Probe failed: {result}")
+                continue
+            _, sent, latest = result
+            print(f"   Send result: {sent}")
             print(f"   Latest heartbeat data: {latest}")
         
         # 4. Create state manager
         print("\n4. Creating state manager...")
         with open('config.yaml', 'r') as f:
-            app_config = yaml.safe_load(f)
+            app_config = yaml.load(f, Loader=_Loader)
         
         state_config = app_config.get('state', {})
         state_manager = await create_state_manager(controller, state_config)
@@ -63,6 +85,11 @@ async def debug_heartbeat():
         for hb_def in state_manager.heartbeat_definitions:
             print(f"   - {hb_def}")
         
+        # State keys the heartbeat definitions will populate
+        hb_expected = frozenset(
+            hb_def['status_path'] for hb_def in state_manager.heartbeat_definitions
+        )
+        
         # 6. Start state monitoring
         print("\n6. Starting state monitoring...")
         await state_manager.start_continuous_refresh()
@@ -77,39 +104,50 @@ async def debug_heartbeat():
         print(f"\n   Total states: {len(all_states)}")
         
         # Look for heartbeat states
-        heartbeat_states = {k: v for k, v in all_states.items() if 'heartbeat' in k}
-        print(f"\n   Heartbeat states found: {len(heartbeat_states)}")
-        for key, value in heartbeat_states.items():
+        hb_items = [(k, all_states[k]) for k in sorted(hb_expected) if k in all_states]
+        print(f"\n   Heartbeat states found: {len(hb_items)}")
+        for key, value in hb_items:
             print(f"   - {key}: {value}")
         
         # 8. Monitor for updates
         print("\n8. Monitoring for heartbeat updates (30 seconds)...")
         
         update_count = 0
-        start_time = asyncio.get_event_loop().time()
-        
-        async for state in state_manager.get_state_updates():
-            # Check for heartbeat keys
-            hb_keys = [k for k in state.keys() if 'heartbeat' in k]
-            if hb_keys:
-                update_count += 1
-                elapsed = asyncio.get_event_loop().time() - start_time
-                print(f"\n   Heartbeat update #{update_count} at {elapsed:.1f}s:")
-                for key in hb_keys:
-                    print(f"   - {key}: {state[key]}")
-            
-            if asyncio.get_event_loop().time() - start_time > 30:
-                break
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + 30
+        
+        # get_state_updates() swallows cancellation and ends, so the deadline is
+        # enforced around each next item rather than by cancelling the loop body
+        updates = state_manager.get_state_updates()
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    state = await asyncio.wait_for(anext(updates), remaining)
+                except (asyncio.TimeoutError, StopAsyncIteration):
+                    break
+                
+                # Check for heartbeat keys
+                hb_keys = sorted(hb_expected & state.keys())
+                if hb_keys:
+                    update_count += 1
+                    elapsed = loop.time() - start_time
+                    # Emit the whole update with a single write
+                    lines = [f"\n   Heartbeat update #{update_count} at {elapsed:.1f}s:"]
+                    lines.extend(f"   - {key}: {state[key]}" for key in hb_keys)
+                    sys.stdout.write("\n".join(lines) + "\n")
+        finally:
+            await updates.aclose()
         
         # Cleanup
         await state_manager.stop_continuous_refresh()
         await controller.disconnect_all()
         
-    except Exception as e:
-        print(f"\n❌ Debug failed: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logging.exception("❌ Debug failed")
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(debug_heartbeat())
\ No newline at end of file
@@ -4,6 +4,17 @@
 import asyncio
 import logging
 import yaml
+from collections import defaultdict
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader  # PyYAML built without libyaml
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Not available on Windows, the default event loop is used
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -34,65 +45,85 @@ async def test_clean_system():
         # 3. Test MQTT commands
         print("\n3. Testing MQTT device commands...")
         
-        # Test hvac device (therm prefix)
-        if hasattr(controller, 'hvac'):
-            print("\n   Testing hvac device:")
+        # Devices are independent, so each one's probe sequence runs concurrently.
+        # Probes collect their output and it is printed per device afterwards.
+        async def probe_hvac(hvac):
+            # Test hvac device (therm prefix)
+            lines = ["\n   Testing hvac device:"]
             
             # Test temperature sensor
-            if hasattr(controller.hvac, 'temp_sensor'):
-                print("   - Sending read_temperature command...")
-                await controller.hvac.temp_sensor.read_temperature()
+            if (temp_sensor := getattr(hvac, 'temp_sensor', None)) is not None:
+                lines.append("   - Sending read_temperature command...")
                 
-                # Wait and check for status
-                await asyncio.sleep(2)
-                temp_status = controller.hvac.temp_sensor.get_latest_status('temp_status')
-                print(f"   - Temperature status: {temp_status}")
+                # Returns as soon as the status arrives, or None after 2 seconds
+                temp_status = await temp_sensor.execute_and_wait_for_status(
+                    'read_temperature', 'temp_status', timeout=2
+                )
+                lines.append(f"   - Temperature status: {temp_status}")
             
             # Test valve
-            if hasattr(controller.hvac, 'avery_valve'):
-                print("   - Testing valve on/off...")
-                await controller.hvac.avery_valve.on()
+            if (valve := getattr(hvac, 'avery_valve', None)) is not None:
+                lines.append("   - Testing valve on/off...")
+                await valve.on()
                 await asyncio.sleep(1)
-                await controller.hvac.avery_valve.off()
-                print("   - Valve commands sent")
+                await valve.off()
+                lines.append("   - Valve commands sent")
+            return lines
         
-        # Test scrumpi device
-        if hasattr(controller, 'living_room'):
-            print("\n   Testing living_room device (scrumpi prefix):")
+        async def probe_scrumpi(living_room):
+            # Test scrumpi device
+            lines = ["\n   Testing living_room device (scrumpi prefix):"]
             
-            if hasattr(controller.living_room, 'temp_sensor'):
-                print("   - Testing ScrumpiTempSensor...")
-                result = await controller.living_room.temp_sensor.execute_and_wait_for_status(
+            if (temp_sensor := getattr(living_room, 'temp_sensor', None)) is not None:
+                lines.append("   - Testing ScrumpiTempSensor...")
+                result = await temp_sensor.execute_and_wait_for_status(
                     'read_temp', 'temp_status', timeout=5
                 )
-                print(f"   - Scrumpi temp result: {result}")
+                lines.append(f"   - Scrumpi temp result: {result}")
             
-            if hasattr(controller.living_room, 'pressure_sensor'):
-                print("   - Testing ScrumpiBaroSensor...")
-                result = await controller.living_room.pressure_sensor.execute_and_wait_for_status(
+            if (pressure_sensor := getattr(living_room, 'pressure_sensor', None)) is not None:
+                lines.append("   - Testing ScrumpiBaroSensor...")
+                result = await pressure_sensor.execute_and_wait_for_status(
                     'read_baro', 'baro_status', timeout=5
                 )
-                print(f"   - Scrumpi baro result: {result}")
+                lines.append(f"   - Scrumpi baro result: {result}")
+            return lines
         
-        # 4. Test ESPHome devices
-        if hasattr(controller, 'living_room_ac'):
-            print("\n   Testing ESPHome AC:")
+        async def probe_ac(living_room_ac):
+            # 4. Test ESPHome devices
+            lines = ["\n   Testing ESPHome AC:"]
             
-            if hasattr(controller.living_room_ac, 'ac'):
+            if (ac := getattr(living_room_ac, 'ac', None)) is not None:
                 # Get current temperature
-                temp_status = await controller.living_room_ac.ac.get_temp_status()
-                print(f"   - AC temperature: {temp_status}")
+                temp_status = await ac.get_temp_status()
+                lines.append(f"   - AC temperature: {temp_status}")
                 
                 # Get mode
-                mode_status = await controller.living_room_ac.ac.get_mode_status()
-                print(f"   - AC mode: {mode_status}")
+                mode_status = await ac.get_mode_status()
+                lines.append(f"   - AC mode: {mode_status}")
+            return lines
+        
+        # Resolve each device once; probes receive it instead of re-walking the controller
+        registry = {name: getattr(controller, name, None)
+                    for name in ('hvac', 'living_room', 'living_room_ac')}
+        probes = [(probe, registry[name]) for name, probe in (('hvac', probe_hvac),
+                                                              ('living_room', probe_scrumpi),
+                                                              ('living_room_ac', probe_ac))
+                  if registry[name] is not None]
+        results = await asyncio.gather(*(probe(device) for probe, device in probes),
+                                       return_exceptions=True)
+        for (probe, _), result in zip(probes, results):
+            if isinstance(result, Exception):
+                print(f"\n   ❌ {probe.__name__} failed: {result}")
+            else:
+                print("\n".join(result))
         
         # 5. Test state manager
         print("\n4. Testing state manager...")
         
         # Load state config
         with open('config.yaml', 'r') as f:
-            app_config = yaml.safe_load(f)
+            app_config = yaml.load(f, Loader=_Loader)
         
         state_config = app_config.get('state', {})
         state_manager = await create_state_manager(controller, state_config)
@@ -109,18 +140,11 @@ async def test_clean_system():
         print(f"\n5. Current states ({len(all_states)} total):")
         
         # Group by device
-        by_device = {}
+        by_device = defaultdict(dict)
         for key, value in all_states.items():
-            if '.' in key:
-                device = key.split('.')[0]
-                if device not in by_device:
-                    by_device[device] = {}
-                by_device[device][key] = value
-            else:
-                # Internal state
-                if '_internal' not in by_device:
-                    by_device['_internal'] = {}
-                by_device['_internal'][key] = value
+            # Dotless keys are internal state
+            device, sep, _ = key.partition('.')
+            by_device[device if sep else '_internal'][key] = value
         
         # Display organized
         for device, states in sorted(by_device.items()):
@@ -139,22 +163,33 @@ async def test_clean_system():
         print("\n6. Monitoring live updates for 15 seconds...")
         
         update_count = 0
-        start_time = asyncio.get_event_loop().time()
-        
-        async for state in state_manager.get_state_updates():
-            update_count += 1
-            elapsed = asyncio.get_event_loop().time() - start_time
-            
-            print(f"\n   Update #{update_count} at {elapsed:.1f}s")
-            
-            # Show temperature changes
-            for key, value in state.items():
-                if 'temp_status' in key and isinstance(value, dict):
-                    temp = value.get('temperature', 'N/A')
-                    print(f"     {key}: {temp}°F")
-            
-            if elapsed > 15:
-                break
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + 15
+        
+        # Same per-item deadline as the heartbeat monitor in test_heartbeats.py
+        updates = state_manager.get_state_updates()
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    state = await asyncio.wait_for(anext(updates), remaining)
+                except (asyncio.TimeoutError, StopAsyncIteration):
+                    break
+                
+                update_count += 1
+                elapsed = loop.time() - start_time
+                
+                # Collect the update's lines so it prints as one block
+                lines = [f"\n   Update #{update_count} at {elapsed:.1f}s"]
+                
+                # Show temperature changes
+                for key, value in state.items():
+                    if 'temp_status' in key and isinstance(value, dict):
+                        temp = value.get('temperature', 'N/A')
+                        lines.append(f"     {key}: {temp}°F")
+                print("\n".join(lines))
+        finally:
+            await updates.aclose()
         
         print("\n✅ Clean architecture test completed!")
         
@@ -162,10 +197,8 @@ async def test_clean_system():
         await state_manager.stop_continuous_refresh()
         await controller.disconnect_all()
         
-    except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logging.exception("❌ Test failed")
 
 
 async def test_mqtt_topics():
@@ -185,6 +218,11 @@ async def test_mqtt_topics():
 
 
 if __name__ == "__main__":
-    # Run tests
-    asyncio.run(test_clean_system())
-    asyncio.run(test_mqtt_topics())
\ No newline at end of file
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    # Run tests on one event loop
+    async def _main():
+        await test_clean_system()
+        await test_mqtt_topics()
+    
+    asyncio.run(_main())
\ No newline at end of file